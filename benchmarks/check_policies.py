@@ -0,0 +1,329 @@
+"""Cross-check the policies against naive reference implementations.
+
+Runs every built-in policy through the engine on random reference
+strings, step by step, through run(), and through run() collapsing runs
+of repeats ("Compact repeats"), and compares the fault counts with straightforward list-based versions of
+the same algorithms; the OPT frames are compared too, for its
+lowest-frame tie-break. lru_fault_curve and opt_fault_curve are compared
+with naive LRU and OPT runs at every frame count.
+
+The reference versions favour obviousness over speed (O(frames) per
+reference, O(n) scans of the future for OPT), so the traces are short.
+
+Usage:
+    python benchmarks/check_policies.py [--traces 300] [--seed 1]
+
+Exits with status 1 at the first mismatch, printing the case.
+"""
+import argparse
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from engine import PageReplacementEngine  # noqa: E402
+from stackdist import lru_fault_curve, opt_fault_curve  # noqa: E402
+
+
+TRACES = 300
+MAX_LENGTH = 200
+MAX_PAGES = 16  # distinct pages per trace, so hits are common
+MAX_FRAMES = 10
+
+
+def fifo(pages, frame_size):
+    frames, faults = [], 0
+    for page in pages:
+        if page in frames:
+            continue
+        faults += 1
+        if len(frames) == frame_size:
+            frames.pop(0)
+        frames.append(page)
+    return faults
+
+
+def lru(pages, frame_size):
+    frames, faults = [], 0  # Least recent first
+    for page in pages:
+        if page in frames:
+            frames.remove(page)
+        else:
+            faults += 1
+            if len(frames) == frame_size:
+                frames.pop(0)
+        frames.append(page)
+    return faults
+
+
+def opt_frames(pages, frame_size):
+    """(faults, final frames) of OPT, evicting from the lowest frame on ties"""
+    frames, faults = [], 0
+    for i, page in enumerate(pages):
+        if page in frames:
+            continue
+        faults += 1
+        if len(frames) < frame_size:
+            frames.append(page)
+            continue
+        future = pages[i + 1:]
+        next_uses = [future.index(p) if p in future else len(future) for p in frames]
+        frames[next_uses.index(max(next_uses))] = page
+    return faults, frames
+
+
+def opt(pages, frame_size):
+    return opt_frames(pages, frame_size)[0]
+
+
+def clock(pages, frame_size):
+    frames, referenced, hand, faults = [], [], 0, 0
+    for page in pages:
+        if page in frames:
+            referenced[frames.index(page)] = True
+            continue
+        faults += 1
+        if len(frames) < frame_size:
+            frames.append(page)
+            referenced.append(True)
+            continue
+        while referenced[hand]:
+            referenced[hand] = False
+            hand = (hand + 1) % frame_size
+        frames[hand] = page
+        referenced[hand] = True
+        hand = (hand + 1) % frame_size
+    return faults
+
+
+def lfu(pages, frame_size):
+    # Counts restart when a page is evicted; among equal counts the page
+    # referenced least recently goes first
+    count, last_use, faults = {}, {}, 0
+    for i, page in enumerate(pages):
+        if page in count:
+            count[page] += 1
+        else:
+            faults += 1
+            if len(count) == frame_size:
+                victim = min(count, key=lambda p: (count[p], last_use[p]))
+                del count[victim]
+            count[page] = 1
+        last_use[page] = i
+    return faults
+
+
+def arc(pages, frame_size):
+    c = frame_size
+    t1, t2, b1, b2 = [], [], [], []  # Least recent first
+    target, faults = 0, 0
+
+    def replace(page):
+        if t1 and (len(t1) > target or (page in b2 and len(t1) == target)):
+            b1.append(t1.pop(0))
+        else:
+            b2.append(t2.pop(0))
+
+    for page in pages:
+        if page in t1 or page in t2:
+            (t1 if page in t1 else t2).remove(page)
+            t2.append(page)
+            continue
+        faults += 1
+        if page in b1:
+            target = min(c, target + max(len(b2) // len(b1), 1))
+            replace(page)
+            b1.remove(page)
+            t2.append(page)
+        elif page in b2:
+            target = max(0, target - max(len(b1) // len(b2), 1))
+            replace(page)
+            b2.remove(page)
+            t2.append(page)
+        else:
+            if len(t1) + len(b1) == c:
+                if len(t1) < c:
+                    b1.pop(0)
+                    replace(page)
+                else:
+                    t1.pop(0)
+            elif len(t1) + len(t2) + len(b1) + len(b2) >= c:
+                if len(t1) + len(t2) + len(b1) + len(b2) == 2 * c:
+                    b2.pop(0)
+                if len(t1) + len(t2) == c:
+                    replace(page)
+            t1.append(page)
+    return faults
+
+
+def two_q(pages, frame_size):
+    kin, kout = max(1, frame_size // 4), max(1, frame_size // 2)
+    a1in, a1out, am = [], [], []  # Oldest / least recent first
+    faults = 0
+    for page in pages:
+        if page in am:
+            am.remove(page)
+            am.append(page)
+            continue
+        if page in a1in:
+            continue
+        faults += 1
+        remembered = page in a1out
+        if len(a1in) + len(am) == frame_size:
+            if len(a1in) > kin or not am:
+                a1out.append(a1in.pop(0))
+                if len(a1out) > kout:
+                    a1out.pop(0)
+            else:
+                am.pop(0)
+        if remembered:
+            if page in a1out:
+                a1out.remove(page)
+            am.append(page)
+        else:
+            a1in.append(page)
+    return faults
+
+
+def lirs(pages, frame_size):
+    lir_limit = frame_size - max(1, frame_size // 100)
+    stack, queue, ghosts = [], [], []  # S bottom first, Q front first
+    lir = set()
+    faults = 0
+
+    def to_top(page, pages_list):
+        if page in pages_list:
+            pages_list.remove(page)
+        pages_list.append(page)
+
+    def prune():
+        while stack and stack[0] not in lir:
+            bottom = stack.pop(0)
+            if bottom in ghosts:
+                ghosts.remove(bottom)
+
+    for page in pages:
+        if page in lir:
+            at_bottom = stack[0] == page
+            to_top(page, stack)
+            if at_bottom:
+                prune()
+            continue
+        resident = page in queue
+        if not resident:
+            faults += 1
+            if len(lir) < lir_limit:
+                lir.add(page)
+                stack.append(page)
+                continue
+            if len(lir) + len(queue) == frame_size:
+                victim = queue.pop(0)
+                if victim in stack:
+                    ghosts.append(victim)
+                    if len(ghosts) > 2 * frame_size:
+                        stack.remove(ghosts.pop(0))
+        if page in ghosts:
+            ghosts.remove(page)
+        if page in stack and lir_limit:
+            # Short reuse distance: promote, and demote the bottom LIR page
+            if page in queue:
+                queue.remove(page)
+            lir.add(page)
+            to_top(page, stack)
+            bottom = stack.pop(0)
+            lir.discard(bottom)
+            queue.append(bottom)
+            prune()
+        else:
+            to_top(page, stack)
+            to_top(page, queue)
+    return faults
+
+
+REFERENCES = {"FIFO": fifo, "LRU": lru, "OPT": opt, "CLOCK": clock, "LFU": lfu,
+              "ARC": arc, "2Q": two_q, "LIRS": lirs}
+
+
+def random_trace(rng):
+    """A short random reference string, with runs of repeats now and then"""
+    distinct = rng.randint(1, MAX_PAGES)
+    pages = []
+    while len(pages) < rng.randint(1, MAX_LENGTH):
+        page = rng.randrange(distinct)
+        pages.extend([page] * (rng.randint(2, 8) if rng.random() < 0.2 else 1))
+    return pages
+
+
+def engine_faults(algorithm, pages, frame_size, path):
+    """Faults of an engine run over `pages` through the given code path"""
+    engine = PageReplacementEngine(algorithm, frame_size, pages)
+    if path == "step":
+        for page in pages:
+            engine.step(page)
+    else:
+        engine.collapse_repeats = path == "collapsed"
+        engine.run(iter(pages))
+    return engine.page_faults
+
+
+def check_trace(pages, frame_size):
+    """Mismatches between the engine and the references on one trace"""
+    mismatches = []
+    for name, reference in REFERENCES.items():
+        expected = reference(pages, frame_size)
+        for path in ("step", "run", "collapsed"):
+            faults = engine_faults(name, pages, frame_size, path)
+            if faults != expected:
+                mismatches.append(f"{name} ({path}): {faults} faults, expected {expected}")
+
+    engine = PageReplacementEngine("OPT", frame_size, pages)
+    engine.run(iter(pages))
+    expected = opt_frames(pages, frame_size)[1]
+    if engine.frames[:len(expected)] != expected:
+        mismatches.append(f"OPT frames: {engine.frames}, expected {expected}")
+    return mismatches
+
+
+def check_curves(pages):
+    """Mismatches between the fault curves and naive runs per frame count"""
+    mismatches = []
+    for name, curve, reference in (("lru_fault_curve", lru_fault_curve, lru),
+                                   ("opt_fault_curve", opt_fault_curve, opt)):
+        for max_frames in (None, len(set(pages)) + 2):
+            faults = list(curve(pages, max_frames))
+            expected = [len(pages)] + [reference(pages, frames)
+                                       for frames in range(1, len(faults))]
+            if max_frames is not None and len(faults) != max_frames + 1:
+                mismatches.append(f"{name}: {len(faults)} frame counts, "
+                                  f"expected {max_frames + 1}")
+            elif faults != expected:
+                mismatches.append(f"{name}(max_frames={max_frames}): {faults}, "
+                                  f"expected {expected}")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--traces", type=int, default=TRACES,
+                        help=f"random traces to check (default {TRACES})")
+    parser.add_argument("--seed", type=int, default=1, help="random seed (default 1)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for _ in range(args.traces):
+        pages = random_trace(rng)
+        frame_size = rng.randint(1, MAX_FRAMES)
+        mismatches = check_trace(pages, frame_size) + check_curves(pages)
+        if mismatches:
+            print(f"Mismatch with {frame_size} frames on {pages}:", file=sys.stderr)
+            for mismatch in mismatches:
+                print(f"  {mismatch}", file=sys.stderr)
+            return 1
+    print(f"{len(REFERENCES)} policies and 2 fault curves match the references "
+          f"on {args.traces} traces", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
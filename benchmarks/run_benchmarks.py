@@ -0,0 +1,361 @@
+"""Benchmarks for the replacement policies and the Memory Frames rendering.
+
+Times every registered policy's engine steps and draw_frames across trace lengths,
+frame counts and workload shapes, and writes the results as JSON:
+throughput (references per second), peak traced memory and per-step
+latency percentiles.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--quick] [--output results.json]
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+
+With --baseline the run exits with status 1 if any case's throughput fell
+more than --tolerance below the stored result, its p99 step latency grew
+more than --latency-tolerance, or its peak memory grew more than
+--memory-tolerance. It also fails for policy cases the baseline lacks.
+Every sample is timed against a calibration loop run right around it,
+and latencies against a short one after every batch of steps, so a
+slower machine, or one that slows down mid-run, doesn't read as a
+regression. Workload shapes need NumPy; the rendering cases are skipped
+when no display is available. A baseline saved without a display has no
+rendering cases, and they stay ungated (with a warning) until it is saved
+again from a machine with one.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import workloads  # noqa: E402
+from engine import PageReplacementEngine  # noqa: E402
+from policies import policy_names  # noqa: E402
+
+
+PAGE_RANGE = 10000
+SEED = 42
+REPEATS = 9  # throughput is the median of this many samples
+MIN_SAMPLE_TIME = 0.05  # seconds; short traces are rerun to fill a sample
+CALIBRATION_OPS = 100000  # calibration loop iterations around each sample
+CALIBRATION_BATCH = 1000  # calibration loop iterations after each latency batch
+LATENCY_SAMPLE = 20000  # steps timed for the percentiles, per sample
+LATENCY_BATCH = 100  # steps per timed batch
+RENDER_STEPS = 300
+RENDER_REPEATS = 3  # rendering runs per frame count; the median is kept
+RENDER_PREFIX = "draw_frames/"
+
+FULL = {"lengths": [10000, 100000], "frames": [10, 100, 1000],
+        "shapes": ["uniform", "zipf", "working_set", "looping"]}
+QUICK = {"lengths": [10000], "frames": [10, 1000],
+         "shapes": ["uniform", "zipf"]}
+
+
+def make_trace(shape, length):
+    """Reference string of the given workload shape as a list of ints"""
+    rng = workloads.make_rng(SEED)
+    if shape == "uniform":
+        chunks = workloads.uniform(length, PAGE_RANGE, rng)
+    elif shape == "zipf":
+        chunks = workloads.zipf(length, PAGE_RANGE, 1.0, rng)
+    elif shape == "working_set":
+        chunks = workloads.working_set(length, PAGE_RANGE, 500, 5000, rng)
+    elif shape == "looping":
+        chunks = workloads.looping(length, 1500)
+    else:
+        raise ValueError(f"Unknown workload shape: {shape}")
+    return workloads.to_array(chunks).tolist()
+
+
+def percentiles(samples, points=(50, 90, 99)):
+    """Nearest-rank percentiles of a list of numbers"""
+    ordered = sorted(samples)
+    if not ordered:
+        return {f"p{p}": None for p in points}
+    return {f"p{p}": ordered[min(len(ordered) - 1, len(ordered) * p // 100)]
+            for p in points}
+
+
+def calibration_loop(ops):
+    """A fixed dict/list workload; its speed stands for the machine's"""
+    table = {}
+    order = []
+    for i in range(ops):
+        key = i % 1000
+        if key in table:
+            table[key] += 1
+        else:
+            table[key] = 1
+            order.append(key)
+
+
+def calibrate():
+    """Operations per second of the calibration loop right now"""
+    start = time.perf_counter()
+    calibration_loop(CALIBRATION_OPS)
+    return CALIBRATION_OPS / (time.perf_counter() - start)
+
+
+def calibrated(measure):
+    """(measure(), calibration speed averaged from just before and after)
+
+    The machine's speed drifts within seconds on shared hosts, so each
+    sample is scaled by a calibration timed around it rather than once
+    per run.
+    """
+    before = calibrate()
+    value = measure()
+    return value, (before + calibrate()) / 2
+
+
+def time_batch(batch, steps, clock=time.perf_counter_ns):
+    """(ns per step, per-step cost in calibration ops) of one call of `batch`
+
+    A short calibration loop is timed right after the batch, so even a
+    brief slowdown of the machine cancels out of the relative cost.
+    """
+    t0 = clock()
+    batch()
+    t1 = clock()
+    calibration_loop(CALIBRATION_BATCH)
+    t2 = clock()
+    per_step = (t1 - t0) / steps
+    return per_step, per_step * CALIBRATION_BATCH / (t2 - t1)
+
+
+def summarize(samples):
+    """Case fields from (speed, calibration, latencies) samples
+
+    `latencies` are time_batch results. relative_speed is the median
+    speed per calibration operation per second, and relative_p99 the
+    median of each sample's p99 step cost in calibration operations; both
+    compare across machines and drifts in machine speed, and a burst of
+    load has to last most of the samples to move them.
+    """
+    latencies = [latency for _, _, batches in samples for latency in batches]
+    return {
+        "calibration_ops_per_sec": statistics.median(c for _, c, _ in samples),
+        "relative_speed": statistics.median(speed / c for speed, c, _ in samples),
+        "relative_p99": statistics.median(
+            percentiles([relative for _, relative in batches])["p99"]
+            for _, _, batches in samples),
+        "step_latency_ns": percentiles([ns for ns, _ in latencies]),
+    }
+
+
+def bench_policy(algorithm, pages, frame_size):
+    """Throughput, peak memory and step latency of one engine run"""
+    def throughput():
+        runs = 0
+        start = time.perf_counter()
+        while True:
+            engine = PageReplacementEngine(algorithm, frame_size, pages)
+            engine.run(iter(pages))
+            runs += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= MIN_SAMPLE_TIME:
+                return runs * len(pages) / elapsed, engine.page_faults
+
+    def step_latencies():
+        # The GUI's step() path, timed in batches; single steps are below
+        # the timer's noise
+        step = PageReplacementEngine(algorithm, frame_size, pages).step
+        sample = pages[:LATENCY_SAMPLE]
+        latencies = []
+        for start in range(0, len(sample), LATENCY_BATCH):
+            batch = sample[start:start + LATENCY_BATCH]
+
+            def run_batch():
+                for page in batch:
+                    step(page)
+            latencies.append(time_batch(run_batch, len(batch)))
+        return latencies
+
+    samples = []
+    for _ in range(REPEATS):
+        (speed, faults), calibration = calibrated(throughput)
+        samples.append((speed, calibration, step_latencies()))
+
+    # Peak memory, measured separately because tracing slows the run
+    tracemalloc.start()
+    PageReplacementEngine(algorithm, frame_size, pages).run(iter(pages))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"refs_per_sec": statistics.median(speed for speed, _, _ in samples),
+            "faults": faults,
+            "peak_bytes": peak,
+            **summarize(samples)}
+
+
+def time_rendering(app, root, frame_size):
+    """time_batch results of every draw_frames in one LRU run of the pages"""
+    app.start_run("LRU", frame_size)
+    app.algorithm = "LRU"
+    latencies = []
+    for page in app.generated_pages:
+        result, _ = app.simulate_step(page)
+
+        def draw():
+            app.draw_frames(result.slot)
+            root.update_idletasks()
+        latencies.append(time_batch(draw, 1))
+        app.current_index += 1
+    return latencies
+
+
+def bench_rendering(frame_counts):
+    """Per-step latency of draw_frames in the real GUI
+
+    Returns an empty dict when Tk can't open a display.
+    """
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        print(f"Skipping rendering benchmarks: {e}", file=sys.stderr)
+        return {}
+
+    from main import PageReplacementSimulator
+
+    results = {}
+    try:
+        root.withdraw()
+        app = PageReplacementSimulator(root)
+        app.generated_pages = make_trace("uniform", RENDER_STEPS)
+        for frame_size in frame_counts:
+            samples = []
+            for _ in range(RENDER_REPEATS):
+                latencies, calibration = calibrated(
+                    lambda: time_rendering(app, root, frame_size))
+                steps_per_sec = 1e9 * len(latencies) / sum(ns for ns, _ in latencies)
+                samples.append((steps_per_sec, calibration, latencies))
+            results[f"{RENDER_PREFIX}frames={frame_size}/steps={RENDER_STEPS}"] = {
+                "steps_per_sec": statistics.median(speed for speed, _, _ in samples),
+                **summarize(samples)}
+    finally:
+        root.destroy()
+    return results
+
+
+def run(config):
+    """Run every case of a configuration and return the results dict"""
+    cases = {}
+    for shape in config["shapes"]:
+        for length in config["lengths"]:
+            pages = make_trace(shape, length)
+            for frame_size in config["frames"]:
+                for algorithm in policy_names():
+                    key = f"{algorithm}/{shape}/n={length}/frames={frame_size}"
+                    cases[key] = bench_policy(algorithm, pages, frame_size)
+                    print(f"{key}: {cases[key]['refs_per_sec']:,.0f} refs/s",
+                          file=sys.stderr)
+
+    cases.update(bench_rendering([3, 10]))
+    return {"python": platform.python_version(),
+            "platform": platform.platform(),
+            "cases": cases}
+
+
+def find_regressions(results, baseline, tolerance, latency_tolerance, memory_tolerance):
+    """Metrics of each case that got worse than the baseline allows
+
+    Throughput may drop by `tolerance` and p99 step latency grow by
+    `latency_tolerance`, both compared relative to the calibration timed
+    with every sample; peak memory doesn't depend on the machine and may
+    grow by `memory_tolerance`. Returns (regressions, compared, unmatched,
+    skipped): regressions are (case, metric, baseline, current, ratio)
+    tuples, unmatched the cases run without a baseline, and skipped the
+    baseline cases this run didn't have.
+    """
+    regressions = []
+    compared = 0
+    for key, base in baseline["cases"].items():
+        current = results["cases"].get(key)
+        if current is None:
+            continue
+        compared += 1
+        ratio = current["relative_speed"] / base["relative_speed"]
+        if ratio < 1 - tolerance:
+            metric = "refs_per_sec" if "refs_per_sec" in base else "steps_per_sec"
+            regressions.append((key, metric, base[metric], current[metric], ratio))
+        ratio = current["relative_p99"] / base["relative_p99"]
+        if ratio > 1 + latency_tolerance:
+            regressions.append((key, "p99_ns", base["step_latency_ns"]["p99"],
+                                current["step_latency_ns"]["p99"], ratio))
+        if "peak_bytes" in base:
+            ratio = current["peak_bytes"] / base["peak_bytes"]
+            if ratio > 1 + memory_tolerance:
+                regressions.append(
+                    (key, "peak_bytes", base["peak_bytes"], current["peak_bytes"], ratio))
+    unmatched = sorted(set(results["cases"]) - set(baseline["cases"]))
+    skipped = sorted(set(baseline["cases"]) - set(results["cases"]))
+    return regressions, compared, unmatched, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true",
+                        help="run a small subset of the cases")
+    parser.add_argument("--output", help="write results JSON to this file")
+    parser.add_argument("--baseline", help="fail on regressions against this JSON")
+    parser.add_argument("--save-baseline", help="store the results as a new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed throughput drop before failing (default 0.25)")
+    parser.add_argument("--latency-tolerance", type=float, default=1.0,
+                        help="allowed p99 step latency growth before failing (default 1.0)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.1,
+                        help="allowed peak memory growth before failing (default 0.1)")
+    args = parser.parse_args()
+    if args.save_baseline and args.quick:
+        parser.error("a baseline needs the full set of cases; drop --quick")
+
+    results = run(QUICK if args.quick else FULL)
+
+    text = json.dumps(results, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    if args.save_baseline:
+        if not any(key.startswith(RENDER_PREFIX) for key in results["cases"]):
+            print("Warning: no display, so the baseline has no rendering cases; "
+                  "save it again from a machine with one", file=sys.stderr)
+        with open(args.save_baseline, "w") as f:
+            f.write(text + "\n")
+    if not args.output and not args.save_baseline:
+        print(text)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions, compared, unmatched, skipped = find_regressions(
+            results, baseline, args.tolerance, args.latency_tolerance,
+            args.memory_tolerance)
+        for key, metric, base, current, ratio in regressions:
+            print(f"REGRESSION {key}: {metric} {current:,.0f} vs baseline "
+                  f"{base:,.0f} ({ratio:.0%})", file=sys.stderr)
+        # A baseline saved without a display can't gate rendering yet
+        ungated = [key for key in unmatched if key.startswith(RENDER_PREFIX)]
+        unmatched = [key for key in unmatched if not key.startswith(RENDER_PREFIX)]
+        for key in unmatched:
+            print(f"NO BASELINE {key}: regenerate the baseline", file=sys.stderr)
+        for key in ungated:
+            print(f"Warning: {key} not gated, the baseline has no rendering cases",
+                  file=sys.stderr)
+        if skipped:
+            print(f"Not run, so not compared: {len(skipped)} baseline cases "
+                  f"(e.g. {skipped[0]})", file=sys.stderr)
+        if regressions or unmatched:
+            return 1
+        print(f"No regressions in {compared} cases compared against baseline",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
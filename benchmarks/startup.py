@@ -0,0 +1,146 @@
+"""Cold-start benchmark for the CLI, the GUI and frozen executables.
+
+Every case is a fresh process, timed from launch to exit; the reported
+figures are the min, median and p90 over --runs launches, after one
+untimed launch that warms the bytecode and OS file caches.
+
+Cases:
+- python: the bare interpreter, for reference
+- import: importing every simulation module; also checks that none of
+  them pulls in tkinter or NumPy
+- cli-help, cli-run: src/batch.py printing its help, and simulating a
+  small trace with one worker
+- gui: src/main.py --startup-probe, which quits once the window is up
+  (skipped when no display is available)
+- frozen-gui, frozen-cli: the same for PyInstaller builds given with
+  --exe and --cli-exe
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--output startup.json]
+    python benchmarks/startup.py --exe dist/main/main.exe --cli-exe dist/batch/batch.exe
+    python benchmarks/startup.py --max-ms 500
+
+With --max-ms the run exits with status 1 if any case's median is slower.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+RUNS = 10
+TIMEOUT = 60  # seconds before a launch counts as hung
+SIMULATION_MODULES = ("engine", "policies", "batch", "analytics", "shards", "processes",
+                      "preprocess", "compare", "checkpoints", "runner", "profiler",
+                      "history", "simlog", "stackdist", "traces", "charts")
+HEAVY_MODULES = ("tkinter", "numpy")  # must not be loaded by SIMULATION_MODULES
+
+IMPORT_CHECK = f"""
+import sys
+sys.path.insert(0, {SRC!r})
+import {", ".join(SIMULATION_MODULES)}
+loaded = [name for name in {HEAVY_MODULES!r} if name in sys.modules]
+if loaded:
+    sys.exit("imported " + ", ".join(loaded))
+"""
+
+
+def time_launch(command):
+    """Seconds from launch to exit of one process
+
+    Raises RuntimeError if it fails or hangs.
+    """
+    start = time.perf_counter()
+    try:
+        done = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              timeout=TIMEOUT)
+    except subprocess.TimeoutExpired:
+        raise RuntimeError(f"timed out after {TIMEOUT}s") from None
+    elapsed = time.perf_counter() - start
+    if done.returncode:
+        message = done.stderr.decode(errors="replace").strip().splitlines()
+        raise RuntimeError(message[-1] if message else f"exit status {done.returncode}")
+    return elapsed
+
+
+def bench_case(command, runs):
+    """Launch times in ms of `command`: min, median and p90"""
+    time_launch(command)  # Warm-up
+    samples = sorted(1000 * time_launch(command) for _ in range(runs))
+    return {"min_ms": samples[0],
+            "median_ms": samples[len(samples) // 2],
+            "p90_ms": samples[min(len(samples) - 1, len(samples) * 90 // 100)]}
+
+
+def make_cases(trace_path, exe=None, cli_exe=None):
+    """(name, command) of every case to run"""
+    python = sys.executable
+    batch = os.path.join(SRC, "batch.py")
+    cli_args = [trace_path, "--policies", "LRU", "--frames", "4", "--workers", "1"]
+    cases = [
+        ("python", [python, "-c", "pass"]),
+        ("import", [python, "-c", IMPORT_CHECK]),
+        ("cli-help", [python, batch, "--help"]),
+        ("cli-run", [python, batch] + cli_args),
+        ("gui", [python, os.path.join(SRC, "main.py"), "--startup-probe"]),
+    ]
+    if exe:
+        cases.append(("frozen-gui", [exe, "--startup-probe"]))
+    if cli_exe:
+        cases.append(("frozen-cli", [cli_exe] + cli_args))
+    return cases
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=RUNS,
+                        help=f"timed launches per case (default {RUNS})")
+    parser.add_argument("--exe", help="frozen GUI executable to time")
+    parser.add_argument("--cli-exe", help="frozen batch executable to time")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--max-ms", type=float,
+                        help="fail if any case's median launch is slower than this")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, "trace.txt")
+        with open(trace_path, "w") as f:
+            f.write(" ".join(str(i % 7) for i in range(1000)) + "\n")
+
+        cases, skipped = {}, {}
+        for name, command in make_cases(trace_path, args.exe, args.cli_exe):
+            try:
+                cases[name] = bench_case(command, args.runs)
+            except (OSError, RuntimeError) as e:
+                skipped[name] = str(e)
+                print(f"{name}: skipped ({e})", file=sys.stderr)
+                continue
+            print(f"{name}: median {cases[name]['median_ms']:.1f} ms "
+                  f"(min {cases[name]['min_ms']:.1f}, p90 {cases[name]['p90_ms']:.1f})",
+                  file=sys.stderr)
+
+    results = {"python": platform.python_version(), "platform": platform.platform(),
+               "runs": args.runs, "cases": cases, "skipped": skipped}
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    else:
+        print(json.dumps(results, indent=2))
+
+    if "import" in skipped:
+        return 1  # A heavy module crept into the simulation import path
+    if args.max_ms is not None:
+        slow = [name for name, case in cases.items() if case["median_ms"] > args.max_ms]
+        if slow:
+            print(f"Slower than {args.max_ms:.0f} ms: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Working-set and page-fault-frequency analytics over a reference string.
+
+One streaming pass computes, every `sample_every` references:
+
+- the working-set size W(t, delta) for several window sizes delta, i.e.
+  the number of distinct pages among the last delta references
+  (Denning, 1968);
+- the fault rate of a replacement policy over the last `sample_every`
+  references.
+
+It also builds a histogram of inter-fault distances, the number of
+references from one fault to the next.
+
+W(t, delta) is kept incrementally. A reference increases W when its
+page's previous access fell outside the window. The reference leaving the
+window decreases W when it was its page's last access. Both tests only
+need each page's last access time and a ring buffer of the last
+max(delta) references, so the pass costs O(windows) per reference.
+"""
+import csv
+import json
+from array import array
+from collections import namedtuple
+
+from engine import PageReplacementEngine
+from policies import get_policy
+from traces import MappedTrace
+
+
+DEFAULT_POINTS = 500  # samples per series when sample_every isn't given
+
+# Result of profile_workload. working_sets maps each window size to W at
+# every sample; fault_rates holds the fault rate of each sample interval;
+# fault_distances maps an inter-fault distance to its count.
+WorkloadProfile = namedtuple("WorkloadProfile", [
+    "algorithm", "frame_size", "sample_every", "steps", "working_sets",
+    "fault_rates", "fault_distances", "references", "faults"])
+
+
+class WorkingSetTracker:
+    """Working-set sizes W(t, delta) for several windows, one reference at a time"""
+
+    def __init__(self, windows):
+        self.windows = sorted(set(windows))
+        if not self.windows or self.windows[0] <= 0:
+            raise ValueError("Window sizes must be positive.")
+        self.sizes = [0] * len(self.windows)
+        self.last_access = {}  # Page -> time of its latest reference
+        self.recent = [None] * (self.windows[-1] + 1)  # Ring buffer of pages
+        self.time = 0
+
+    def update(self, page):
+        """Add the next reference and slide every window by one"""
+        t = self.time
+        recent = self.recent
+        last_access = self.last_access
+        span = len(recent)
+        previous = last_access.get(page)
+        sizes = self.sizes
+
+        for i, window in enumerate(self.windows):
+            # The reference at t - window leaves; its page drops out of the
+            # working set unless it was referenced again since
+            leaving = t - window
+            if leaving >= 0 and last_access[recent[leaving % span]] == leaving:
+                sizes[i] -= 1
+            # The new reference adds its page unless it is still inside
+            if previous is None or previous <= leaving:
+                sizes[i] += 1
+
+        last_access[page] = t
+        recent[t % span] = page
+        self.time = t + 1
+
+
+def default_windows(length):
+    """Window sizes suited to a trace of `length` references
+
+    Powers of ten up to half the trace, at most four of them; very short
+    traces get small windows instead.
+    """
+    windows = [10 ** k for k in range(1, 10) if 10 ** k <= length // 2][-4:]
+    return windows or [w for w in (2, 5, 10) if w <= max(2, length)]
+
+
+def profile_workload(pages, windows, algorithm, frame_size, sample_every=None):
+    """Stream `pages` once and return a WorkloadProfile
+
+    `algorithm` and `frame_size` choose the policy whose faults are
+    measured. Policies that need the future (OPT) need an indexable
+    `pages`; others accept any iterable.
+    """
+    if sample_every is None:
+        sample_every = max(1, len(pages) // DEFAULT_POINTS)
+    if sample_every <= 0:
+        raise ValueError("Sample interval must be positive.")
+
+    engine = PageReplacementEngine(
+        algorithm, frame_size, pages if get_policy(algorithm).needs_future else None)
+    tracker = WorkingSetTracker(windows)
+    working_sets = {window: array("q") for window in tracker.windows}
+    steps = array("q")
+    fault_rates = array("d")
+    fault_distances = {}
+
+    step = engine.step
+    update = tracker.update
+    last_fault = None
+    interval_faults = 0
+    for t, page in enumerate(pages):
+        update(page)
+        if step(page).fault:
+            interval_faults += 1
+            if last_fault is not None:
+                distance = t - last_fault
+                fault_distances[distance] = fault_distances.get(distance, 0) + 1
+            last_fault = t
+
+        if (t + 1) % sample_every == 0:
+            steps.append(t + 1)
+            for window, size in zip(tracker.windows, tracker.sizes):
+                working_sets[window].append(size)
+            fault_rates.append(interval_faults / sample_every)
+            interval_faults = 0
+
+    # Partial last interval
+    tail = engine.index % sample_every
+    if tail:
+        steps.append(engine.index)
+        for window, size in zip(tracker.windows, tracker.sizes):
+            working_sets[window].append(size)
+        fault_rates.append(interval_faults / tail)
+
+    return WorkloadProfile(algorithm, frame_size, sample_every, steps, working_sets,
+                           fault_rates, dict(sorted(fault_distances.items())),
+                           engine.index, engine.page_faults)
+
+
+def _profile_in_worker(pages, trace_path, trace_fmt, *args):
+    if trace_path is not None:
+        with MappedTrace(trace_path, trace_fmt) as pages:
+            return profile_workload(pages, *args)
+    return profile_workload(pages, *args)
+
+
+def start_analysis(pages, windows, algorithm, frame_size, sample_every=None):
+    """Run profile_workload in a worker process
+
+    Returns (executor, future); the future resolves to the
+    WorkloadProfile. Memory-mapped traces are reopened by path instead of
+    being copied. The caller shuts the executor down.
+    """
+    from concurrent.futures import ProcessPoolExecutor  # Slow to import; only needed here
+
+    if isinstance(pages, MappedTrace):
+        pages, trace_path, trace_fmt = None, pages.path, pages.fmt
+    else:
+        trace_path = trace_fmt = None
+    executor = ProcessPoolExecutor(max_workers=1)
+    future = executor.submit(_profile_in_worker, pages, trace_path, trace_fmt,
+                             windows, algorithm, frame_size, sample_every)
+    return executor, future
+
+
+def distance_summary(fault_distances):
+    """Mean, median, p90 and max of an inter-fault distance histogram"""
+    total = sum(fault_distances.values())
+    if not total:
+        return {"mean": 0.0, "median": 0, "p90": 0, "max": 0}
+    mean = sum(d * c for d, c in fault_distances.items()) / total
+    points = {"median": total * 50 // 100, "p90": total * 90 // 100}
+    summary = {"mean": mean, "max": max(fault_distances)}
+    seen = 0
+    pending = sorted(points.items(), key=lambda item: item[1])
+    for distance, count in sorted(fault_distances.items()):
+        seen += count
+        while pending and seen > pending[0][1]:
+            summary[pending.pop(0)[0]] = distance
+    return summary
+
+
+def distance_buckets(fault_distances):
+    """Group an inter-fault distance histogram into powers of two
+
+    Returns (upper bounds, counts), where counts[i] covers distances in
+    (bounds[i] / 2, bounds[i]].
+    """
+    counts = {}
+    for distance, count in fault_distances.items():
+        bound = 1 << (distance - 1).bit_length()
+        counts[bound] = counts.get(bound, 0) + count
+    bounds = sorted(counts)
+    return bounds, [counts[bound] for bound in bounds]
+
+
+def write_series_csv(profile, f):
+    """Write the sampled series as CSV: step, W per window, fault rate"""
+    writer = csv.writer(f, lineterminator="\n")
+    windows = list(profile.working_sets)
+    writer.writerow(["step"] + [f"ws_{window}" for window in windows] + ["fault_rate"])
+    for i, step in enumerate(profile.steps):
+        writer.writerow([step] + [profile.working_sets[window][i] for window in windows]
+                        + [profile.fault_rates[i]])
+
+
+def write_profile_json(profile, f):
+    """Write the whole profile, distance histogram included, as JSON"""
+    json.dump({
+        "algorithm": profile.algorithm,
+        "frame_size": profile.frame_size,
+        "references": profile.references,
+        "faults": profile.faults,
+        "sample_every": profile.sample_every,
+        "steps": profile.steps.tolist(),
+        "working_sets": {str(w): sizes.tolist() for w, sizes in profile.working_sets.items()},
+        "fault_rates": profile.fault_rates.tolist(),
+        "fault_distances": {str(d): c for d, c in profile.fault_distances.items()},
+        "fault_distance_summary": distance_summary(profile.fault_distances),
+    }, f, indent=2)
+    f.write("\n")
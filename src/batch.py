@@ -0,0 +1,483 @@
+"""Headless batch runner: simulate policies over traces from the command line.
+
+Runs every (trace, policy, frame count) combination on a process pool and
+streams one result record per run as newline-delimited JSON or CSV.
+Optional per-step event records go to one file per run.
+
+Memory use does not grow with the trace. Binary traces are memory-mapped,
+text/CSV traces and generated workloads are streamed through the engine,
+and results are written as soon as each run finishes. Only policies that
+read the future (OPT) load the whole reference string.
+
+Usage:
+    python src/batch.py trace.bin --policies LRU,ARC --frames 1-64
+    python src/batch.py --generate zipf:n=1000000,pages=10000,alpha=0.9,seed=1 \\
+        --frames 100,1000 --format csv --output results.csv
+    python src/batch.py trace.txt --frames 4 --events events/
+    python src/batch.py huge.bin --policies LRU,FIFO --frames 1000,10000 --approximate
+    python src/batch.py --generate zipf:n=10000,pages=500,seed=1 --copies 1000 \
+        --shared --scope global,local --frames 50000 --policies LRU,CLOCK
+
+Generator specs are KIND:key=value,... where KIND is one of the workloads
+module's generators (uniform, zipf, working_set, sequential, looping) and
+the keys are its parameters. Generated workloads need NumPy.
+
+With --approximate each (trace, policy) pair is streamed once through the
+sampled estimators of the shards module, which give the whole fault curve
+with a standard error per frame count. --check also runs the exact engine
+at every frame count, for validating the estimate on smaller traces.
+
+With --shared the traces and workloads become the processes of one
+machine: their references are interleaved round-robin (--quantum at a
+time) against one shared pool of frames, under global replacement, local
+replacement with equal per-process quotas, or both (--scope). --copies N
+runs N processes per source, reseeding random workloads for each copy.
+
+--compact preprocesses every trace before simulating it: runs of repeated
+references become one weighted step and page addresses are renumbered to
+dense IDs. Results are the same; per-step events then have one record per
+weighted step, with its reference count.
+"""
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+
+from engine import PageReplacementEngine
+from policies import get_policy, policy_names
+from preprocess import Interner, compact
+from processes import LOCAL, SCOPES, SharedMemoryEngine, equal_quotas, interleave
+from shards import DEFAULT_SAMPLE_SIZE, approximate_curve
+from traces import DEFAULT_BINARY_FORMAT, TraceFormatError, iter_trace, load_trace, trace_kind
+
+
+RESULT_FIELDS = ("trace", "policy", "frames", "references", "faults", "hits",
+                 "fault_rate", "seconds")
+APPROXIMATE_FIELDS = ("trace", "policy", "frames", "references", "faults", "fault_rate",
+                      "std_error", "sample_rate", "sampled", "seconds")
+CHECK_FIELDS = ("exact_faults", "exact_fault_rate")
+SHARED_FIELDS = ("traces", "policy", "frames", "scope", "processes", "references", "faults",
+                 "hits", "fault_rate", "min_process_fault_rate", "max_process_fault_rate",
+                 "seconds")
+EVENT_FIELDS = ("step", "page", "fault", "slot", "replaced")
+COMPACT_EVENT_FIELDS = EVENT_FIELDS + ("count",)
+GENERATORS = ("uniform", "zipf", "working_set", "sequential", "looping")
+
+
+class RecordWriter:
+    """Write dict records as NDJSON lines or CSV rows"""
+
+    def __init__(self, stream, fmt, fields):
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = fields
+        self.csv = None
+        if fmt == "csv":
+            self.csv = csv.DictWriter(stream, fieldnames=fields, lineterminator="\n")
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv is not None:
+            self.csv.writerow(record)
+        else:
+            self.stream.write(json.dumps(record) + "\n")
+
+
+def parse_frames(text):
+    """Parse frame counts like "1-8,16,32" into a sorted list"""
+    sizes = set()
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        try:
+            low = int(low)
+            high = int(high) if high else low
+        except ValueError:
+            raise ValueError(f"Invalid frame count: {part}") from None
+        if low <= 0 or high < low:
+            raise ValueError(f"Invalid frame count: {part}")
+        sizes.update(range(low, high + 1))
+    if not sizes:
+        raise ValueError("No frame counts given.")
+    return sorted(sizes)
+
+
+def parse_generator(spec):
+    """Parse "kind:key=value,..." into (kind, params)
+
+    A random workload without a seed gets one here, so every run of the
+    batch sees the same references.
+    """
+    kind, _, rest = spec.partition(":")
+    if kind not in GENERATORS:
+        raise ValueError(f"Unknown generator: {kind} (choose from {', '.join(GENERATORS)})")
+    params = {}
+    for item in filter(None, (s.strip() for s in rest.split(","))):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected key=value in generator spec: {item}")
+        try:
+            params[key] = int(value)
+        except ValueError:
+            try:
+                params[key] = float(value)
+            except ValueError:
+                params[key] = {"true": True, "false": False}.get(value.lower(), value)
+    if "n" not in params:
+        raise ValueError("Generator spec needs n=<number of references>.")
+
+    import inspect
+    import workloads
+    generator = getattr(workloads, kind)
+    accepted = inspect.signature(generator).parameters
+    if "rng" in accepted:
+        params["rng"] = params.pop("seed", None)
+        if params["rng"] is None:
+            params["rng"] = random.randrange(2**32)
+    unknown = set(params) - set(accepted)
+    if unknown:
+        raise ValueError(f"Unknown {kind} parameters: {', '.join(sorted(unknown))}")
+    return kind, params
+
+
+def open_source(source, needs_future, fmt, column):
+    """Pages of a trace path or generator spec for one run
+
+    Returns (pages, closer). Pages are streamed unless the policy needs the
+    whole reference string.
+    """
+    if isinstance(source, str):
+        if needs_future or trace_kind(source) == "binary":
+            pages = load_trace(source, fmt, column)
+            return pages, getattr(pages, "close", None)
+        return iter_trace(source, fmt, column), None
+
+    import workloads
+    kind, params = source
+    chunks = getattr(workloads, kind)(**params)
+    if needs_future:
+        return workloads.to_array(chunks).tolist(), None
+    return workloads.iter_pages(chunks), None
+
+
+def describe_source(source):
+    """Short label of a trace path or generator spec for the records"""
+    if isinstance(source, str):
+        return source
+    kind, params = source
+    params = {("seed" if key == "rng" else key): value for key, value in params.items()}
+    return kind + ":" + ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def run_one(source, policy, frame_size, fmt=DEFAULT_BINARY_FORMAT, column=0,
+            events_path=None, events_format="ndjson", compacted=False):
+    """Simulate one policy at one frame count and return its result record
+
+    With `compacted`, the references go through preprocess.compact first.
+    """
+    needs_future = get_policy(policy).needs_future
+    pages, closer = open_source(source, needs_future, fmt, column)
+    try:
+        engine = PageReplacementEngine(policy, frame_size, pages if needs_future else None)
+        start = time.perf_counter()
+        if compacted:
+            interner = Interner()
+            runs = compact(pages, interner)
+            if events_path is None:
+                engine.run_weighted(runs)
+            else:
+                with open(events_path, "w", newline="") as f:
+                    writer = RecordWriter(f, events_format, COMPACT_EVENT_FIELDS)
+                    for page_id, count in runs:
+                        step = engine.step_run(page_id, count)
+                        writer.write({"step": step.index, "page": interner.address(step.page),
+                                      "fault": step.fault, "slot": step.slot,
+                                      "replaced": interner.address(step.replaced),
+                                      "count": count})
+        elif events_path is None:
+            engine.run(iter(pages))
+        else:
+            with open(events_path, "w", newline="") as f:
+                writer = RecordWriter(f, events_format, EVENT_FIELDS)
+                for page in pages:
+                    step = engine.step(page)
+                    writer.write({"step": step.index, "page": step.page, "fault": step.fault,
+                                  "slot": step.slot, "replaced": step.replaced})
+        seconds = time.perf_counter() - start
+    finally:
+        if closer is not None:
+            closer()
+
+    references = engine.index
+    return {"trace": describe_source(source), "policy": policy, "frames": frame_size,
+            "references": references, "faults": engine.page_faults, "hits": engine.hits,
+            "fault_rate": engine.page_faults / references if references else 0.0,
+            "seconds": round(seconds, 6)}
+
+
+def run_approximate(source, policy, frame_sizes, fmt=DEFAULT_BINARY_FORMAT, column=0,
+                    sample_size=DEFAULT_SAMPLE_SIZE, rate=None, check=False):
+    """Estimate one policy's fault curve and return a record per frame count
+
+    With `check`, each record also gets the exact fault count.
+    """
+    pages, closer = open_source(source, False, fmt, column)
+    try:
+        start = time.perf_counter()
+        curve = approximate_curve(pages, policy, frame_sizes, sample_size, rate)
+        seconds = time.perf_counter() - start
+    finally:
+        if closer is not None:
+            closer()
+
+    records = []
+    for frames, ratio, error, faults in zip(curve.frame_sizes, curve.miss_ratios,
+                                            curve.std_errors, curve.faults):
+        records.append({"trace": describe_source(source), "policy": policy, "frames": frames,
+                        "references": curve.references, "faults": faults,
+                        "fault_rate": ratio, "std_error": error, "sample_rate": curve.rate,
+                        "sampled": curve.sampled, "seconds": round(seconds, 6)})
+    if check:
+        for record in records:
+            exact = run_one(source, policy, record["frames"], fmt, column)
+            record["exact_faults"] = exact["faults"]
+            record["exact_fault_rate"] = exact["fault_rate"]
+    return records
+
+
+def run_shared(sources, label, policy, frame_size, scope, quantum=1,
+               fmt=DEFAULT_BINARY_FORMAT, column=0):
+    """Run every source as one process against a shared frame pool
+
+    Returns the result record; `label` names the sources in it.
+    """
+    needs_future = get_policy(policy).needs_future
+    opened = [open_source(source, needs_future, fmt, column) for source in sources]
+    try:
+        streams = {pid: pages for pid, (pages, _) in enumerate(opened)}
+        references = interleave(streams, quantum)
+        if needs_future:
+            references = list(references)
+        quotas = equal_quotas(streams, frame_size) if scope == LOCAL else None
+        engine = SharedMemoryEngine(policy, frame_size, scope, quotas,
+                                    references if needs_future else None)
+        start = time.perf_counter()
+        engine.run(iter(references))
+        seconds = time.perf_counter() - start
+    finally:
+        for _, closer in opened:
+            if closer is not None:
+                closer()
+
+    references = engine.index
+    rates = [faults / steps for steps, faults, _ in engine.process_stats().values() if steps]
+    return {"traces": label, "policy": policy, "frames": frame_size, "scope": scope,
+            "processes": len(sources), "references": references,
+            "faults": engine.page_faults, "hits": engine.hits,
+            "fault_rate": engine.page_faults / references if references else 0.0,
+            "min_process_fault_rate": min(rates, default=0.0),
+            "max_process_fault_rate": max(rates, default=0.0),
+            "seconds": round(seconds, 6)}
+
+
+def copy_sources(sources, copies):
+    """Each source `copies` times, random workloads with successive seeds"""
+    copied = []
+    for source in sources:
+        for i in range(copies):
+            if isinstance(source, str) or "rng" not in source[1]:
+                copied.append(source)
+            else:
+                kind, params = source
+                params = dict(params)
+                params["rng"] += i
+                copied.append((kind, params))
+    return copied
+
+
+def events_file(directory, index, source, policy, frame_size, events_format):
+    """Path of the per-step event file for one run"""
+    name = os.path.splitext(os.path.basename(source))[0] if isinstance(source, str) else source[0]
+    ext = "csv" if events_format == "csv" else "ndjson"
+    return os.path.join(directory, f"{index:03d}-{name}-{policy}-{frame_size}.{ext}")
+
+
+def run_batch(sources, policies, frame_sizes, writer, workers=None,
+              fmt=DEFAULT_BINARY_FORMAT, column=0, events_dir=None, events_format="ndjson",
+              approximate=False, sample_size=DEFAULT_SAMPLE_SIZE, rate=None, check=False,
+              scopes=None, quantum=1, copies=1, compacted=False):
+    """Run every combination and write each result record as it finishes
+
+    With `approximate`, each (source, policy) pair is one run that
+    estimates every frame count. With `scopes`, all sources (`copies`
+    times each) are the processes of one shared-memory run per (policy,
+    frame count, scope). `compacted` preprocesses the exact runs. Returns the
+    number of runs.
+    """
+    runs = []
+    if scopes:
+        label = "+".join(describe_source(source) for source in sources)
+        processes = copy_sources(sources, copies)
+        for policy in policies:
+            for frame_size in frame_sizes:
+                runs.extend((run_shared, processes, label, policy, frame_size, scope,
+                             quantum, fmt, column) for scope in scopes)
+        sources = []
+    for index, source in enumerate(sources):
+        for policy in policies:
+            if approximate:
+                runs.append((run_approximate, source, policy, frame_sizes, fmt, column,
+                             sample_size, rate, check))
+                continue
+            for frame_size in frame_sizes:
+                events_path = None
+                if events_dir is not None:
+                    events_path = events_file(events_dir, index, source, policy,
+                                              frame_size, events_format)
+                runs.append((run_one, source, policy, frame_size, fmt, column,
+                             events_path, events_format, compacted))
+
+    workers = min(workers or os.cpu_count() or 1, len(runs))
+    if workers <= 1:
+        for run, *args in runs:
+            write_records(writer, run(*args))
+        return len(runs)
+
+    # Imported here so single-worker runs start faster
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(*run) for run in runs]
+        for future in as_completed(futures):
+            write_records(writer, future.result())
+    return len(runs)
+
+
+def write_records(writer, result):
+    """Write a run's record (or list of records) and flush"""
+    for record in result if isinstance(result, list) else [result]:
+        writer.write(record)
+    writer.stream.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("traces", nargs="*", help="trace files (.txt, .csv, .bin/.trace/.dat)")
+    parser.add_argument("--generate", action="append", default=[], metavar="SPEC",
+                        help="generated workload, e.g. zipf:n=1000000,pages=10000,seed=1")
+    parser.add_argument("--policies",
+                        help="comma separated policies (default: all, or all that "
+                             "can be approximated with --approximate)")
+    parser.add_argument("--frames", default="1-10",
+                        help="frame counts, e.g. 1-8,16,32 (default 1-10)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--format", choices=("ndjson", "csv"), default="ndjson",
+                        help="output format (default ndjson)")
+    parser.add_argument("--output", help="write results here instead of stdout")
+    parser.add_argument("--events", metavar="DIR",
+                        help="also write per-step events, one file per run, to DIR")
+    parser.add_argument("--approximate", action="store_true",
+                        help="estimate fault curves from a hashed sample of pages")
+    parser.add_argument("--sample-size", type=int, default=DEFAULT_SAMPLE_SIZE,
+                        help=f"pages kept by the LRU sampler (default {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument("--sample-rate", type=float, default=None,
+                        help="sampling rate of the other policies (default: from the frames)")
+    parser.add_argument("--check", action="store_true",
+                        help="with --approximate, also report the exact fault counts")
+    parser.add_argument("--shared", action="store_true",
+                        help="run all sources as processes sharing one frame pool")
+    parser.add_argument("--scope", default=",".join(SCOPES),
+                        help="with --shared: global, local or both (default both)")
+    parser.add_argument("--quantum", type=int, default=1,
+                        help="with --shared: references per process turn (default 1)")
+    parser.add_argument("--copies", type=int, default=1,
+                        help="with --shared: processes per source (default 1)")
+    parser.add_argument("--compact", action="store_true",
+                        help="collapse repeated references and renumber pages before simulating")
+    parser.add_argument("--binary-format", default=DEFAULT_BINARY_FORMAT,
+                        help="array typecode of binary traces (default q)")
+    parser.add_argument("--column", type=int, default=0,
+                        help="page number column of CSV traces (default 0)")
+    args = parser.parse_args(argv)
+
+    try:
+        sources = list(args.traces)
+        sources.extend(parse_generator(spec) for spec in args.generate)
+        if not sources:
+            parser.error("give at least one trace file or --generate spec")
+        if args.policies is not None:
+            policies = [name.strip() for name in args.policies.split(",") if name.strip()]
+        elif args.approximate:
+            policies = [name for name in policy_names() if not get_policy(name).needs_future]
+        else:
+            policies = policy_names()
+        for policy in policies:
+            get_policy(policy)
+        frame_sizes = parse_frames(args.frames)
+        if args.approximate:
+            if args.events:
+                raise ValueError("--events can't be combined with --approximate.")
+            if args.sample_size <= 0:
+                raise ValueError("Sample size must be positive.")
+            if args.sample_rate is not None and not 0 < args.sample_rate <= 1:
+                raise ValueError("Sampling rate must be in (0, 1].")
+            for policy in policies:
+                if get_policy(policy).needs_future:
+                    raise ValueError(f"{policy} needs the whole reference string and "
+                                     f"can't be approximated.")
+        elif args.check:
+            raise ValueError("--check needs --approximate.")
+        if args.compact and (args.approximate or args.shared):
+            raise ValueError("--compact only applies to exact runs.")
+        scopes = None
+        if args.shared:
+            if args.approximate or args.events:
+                raise ValueError("--shared can't be combined with --approximate or --events.")
+            scopes = [scope.strip() for scope in args.scope.split(",") if scope.strip()]
+            for scope in scopes:
+                if scope not in SCOPES:
+                    raise ValueError(f"Unknown replacement scope: {scope}")
+            if args.quantum <= 0 or args.copies <= 0:
+                raise ValueError("Quantum and copies must be positive.")
+            if LOCAL in scopes and frame_sizes[0] < len(sources) * args.copies:
+                raise ValueError("Local replacement needs at least one frame per process.")
+    except ImportError:
+        parser.error("generated workloads need NumPy")
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.events:
+        os.makedirs(args.events, exist_ok=True)
+
+    output = open(args.output, "w", newline="") if args.output else sys.stdout
+    try:
+        if args.shared:
+            fields = SHARED_FIELDS
+        elif args.approximate:
+            fields = APPROXIMATE_FIELDS + (CHECK_FIELDS if args.check else ())
+        else:
+            fields = RESULT_FIELDS
+        writer = RecordWriter(output, args.format, fields)
+        run_batch(sources, policies, frame_sizes, writer, args.workers,
+                  args.binary_format, args.column, args.events, args.format,
+                  args.approximate, args.sample_size, args.sample_rate, args.check,
+                  scopes, args.quantum, args.copies, args.compact)
+    except (OSError, TraceFormatError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    return 0
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # Process pool workers in frozen builds
+    sys.exit(main())
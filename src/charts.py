@@ -0,0 +1,45 @@
+"""Line charts drawn on a Tk canvas for the Compare and Analyze windows.
+
+Only canvas methods are used, so this module doesn't import tkinter
+itself and is loaded the first time a chart window opens.
+"""
+CURVE_COLORS = ("#d62728", "#1f77b4", "#2ca02c", "#ff7f0e", "#9467bd",
+                "#8c564b", "#e377c2", "#7f7f7f")
+
+
+def draw_line_chart(canvas, x_values, series, x_label, y_label):
+    """Draw one polyline per series with axes and a legend"""
+    canvas.delete("all")
+    width, height = canvas.winfo_width(), canvas.winfo_height()
+    left, right, top, bottom = 50, width - 10, 20, height - 35
+    if right <= left or bottom <= top or not x_values:
+        return
+
+    y_max = max((max(values) for values in series.values() if values), default=0) or 1
+    x_min, x_max = x_values[0], x_values[-1]
+    x_span = (x_max - x_min) or 1
+
+    def point(x, y):
+        return (left + (x - x_min) * (right - left) / x_span,
+                bottom - y * (bottom - top) / y_max)
+
+    # Axes and labels
+    canvas.create_line(left, top, left, bottom, right, bottom)
+    canvas.create_text(left - 5, top, anchor="e",
+                       text=f"{y_max:.3g}" if isinstance(y_max, float) else str(y_max))
+    canvas.create_text(left - 5, bottom, text="0", anchor="e")
+    canvas.create_text(left, bottom + 5, text=str(x_min), anchor="n")
+    canvas.create_text(right, bottom + 5, text=str(x_max), anchor="ne")
+    canvas.create_text((left + right) / 2, bottom + 20, text=x_label)
+    canvas.create_text(5, top - 10, text=y_label, anchor="w")
+
+    for i, (name, values) in enumerate(series.items()):
+        color = CURVE_COLORS[i % len(CURVE_COLORS)]
+        points = [coord for x, y in zip(x_values, values) for coord in point(x, y)]
+        if len(points) >= 4:
+            canvas.create_line(*points, fill=color, width=2)
+        elif points:
+            x, y = points
+            canvas.create_oval(x - 3, y - 3, x + 3, y + 3, fill=color, outline=color)
+        # Legend entry
+        canvas.create_text(right - 5, top + 15 * i, text=name, fill=color, anchor="ne")
@@ -0,0 +1,84 @@
+"""Periodic engine checkpoints for seeking within long runs.
+
+The engine only moves forward, so showing an earlier step used to mean
+re-simulating from step 0. A CheckpointStore keeps an engine checkpoint
+every `interval` steps; seeking restores the nearest one at or before the
+target and replays at most `interval` references.
+
+Checkpoints are capped at `budget` bytes. Once they grow past it, every
+other checkpoint is dropped and the interval doubles, so memory stays
+bounded however long the run is.
+"""
+DEFAULT_INTERVAL = 10000  # steps between checkpoints
+DEFAULT_BUDGET = 64 << 20  # bytes of checkpoints kept per run
+ITER_CHUNK = 1 << 16  # references sliced at a time by iter_pages_from
+
+
+class CheckpointStore:
+    """Engine checkpoints of one run, keyed by step index"""
+
+    def __init__(self, interval=DEFAULT_INTERVAL, budget=DEFAULT_BUDGET):
+        if interval <= 0:
+            raise ValueError("Checkpoint interval must be positive.")
+        self.interval = interval
+        self.budget = budget
+        self.blobs = {}  # Step index -> engine.checkpoint() bytes
+        self.size = 0
+
+    def __len__(self):
+        return len(self.blobs)
+
+    def save(self, engine):
+        """Checkpoint the engine at its current step"""
+        if engine.index in self.blobs:
+            return
+        blob = engine.checkpoint()
+        self.blobs[engine.index] = blob
+        self.size += len(blob)
+        while self.size > self.budget and len(self.blobs) > 1:
+            self._thin()
+
+    def _thin(self):
+        """Double the interval, dropping checkpoints off the new grid"""
+        self.interval *= 2
+        for index in [i for i in self.blobs if i % self.interval]:
+            self.size -= len(self.blobs.pop(index))
+
+    def run(self, engine, pages, limit):
+        """engine.run that checkpoints at every interval boundary
+
+        Consumes at most `limit` references from the iterator `pages` and
+        returns how many were processed.
+        """
+        done = 0
+        while done < limit:
+            count = min(limit - done, self.interval - engine.index % self.interval)
+            processed = engine.run(pages, count)
+            done += processed
+            if engine.index % self.interval == 0:
+                self.save(engine)
+            if processed < count:
+                break
+        return done
+
+    def nearest(self, index):
+        """Step of the latest checkpoint at or before `index` (None if none)"""
+        return max((i for i in self.blobs if i <= index), default=None)
+
+    def restore_nearest(self, engine, pages, target):
+        """Restore the closest checkpoint from which to replay up to `target`
+
+        The engine is left alone if it is already between that checkpoint
+        and the target. Returns an iterator over the references from the
+        engine's new step on.
+        """
+        start = self.nearest(target)
+        if start is not None and not start <= engine.index <= target:
+            engine.restore(self.blobs[start])
+        return iter_pages_from(pages, engine.index)
+
+
+def iter_pages_from(pages, start, chunk_size=ITER_CHUNK):
+    """Iterate pages[start:] without walking over the skipped prefix"""
+    for i in range(start, len(pages), chunk_size):
+        yield from pages[i:i + chunk_size]
@@ -0,0 +1,115 @@
+"""Compare algorithms and frame counts over one reference string.
+
+Every (algorithm, frame count) run is independent, so they are spread over
+a process pool. The reference string is handed to each worker once when
+the worker starts, and memory-mapped traces are reopened by path instead
+of being copied. LRU and OPT sweeps use a single stack-distance pass per
+algorithm instead of one run per frame count.
+"""
+import os
+
+from engine import simulate
+from policies import policy_names
+from stackdist import lru_fault_curve, opt_fault_curve
+from traces import MappedTrace
+
+
+# Stack algorithms whose whole fault curve comes from one pass
+STACK_CURVES = {"LRU": lru_fault_curve, "OPT": opt_fault_curve}
+
+
+_worker_pages = None  # Reference string of the current worker process
+
+
+def _init_worker(pages, trace_path, trace_fmt):
+    global _worker_pages
+    if trace_path is not None:
+        _worker_pages = MappedTrace(trace_path, trace_fmt)
+    else:
+        _worker_pages = pages
+
+
+def _run_one(algorithm, frame_size):
+    result = simulate(_worker_pages, frame_size, algorithm, record_steps=False)
+    return [(algorithm, frame_size, result.faults)]
+
+
+def _run_curve(algorithm, frame_sizes):
+    curve = STACK_CURVES[algorithm](_worker_pages, max(frame_sizes))
+    return [(algorithm, frame_size, curve[frame_size]) for frame_size in frame_sizes]
+
+
+def use_stack_curve(algorithm, frame_sizes):
+    """Whether one stack-distance pass beats separate runs per size
+
+    The OPT pass costs O(max frames) per reference, so it only pays off
+    when the sizes cover most of 1..max, as in a sweep.
+    """
+    if algorithm not in STACK_CURVES or len(frame_sizes) < 2:
+        return False
+    return algorithm == "LRU" or 4 * len(frame_sizes) >= max(frame_sizes)
+
+
+def start_comparison(pages, algorithms=None, frame_sizes=range(1, 11),
+                     workers=None):
+    """Submit every run to a new process pool
+
+    Returns (executor, futures); each future resolves to a list of
+    (algorithm, frame_size, faults). The caller shuts the executor down.
+    `algorithms` defaults to every registered policy.
+    """
+    if algorithms is None:
+        algorithms = policy_names()
+    if isinstance(pages, MappedTrace):
+        initargs = (None, pages.path, pages.fmt)
+    else:
+        initargs = (pages, None, None)
+
+    frame_sizes = list(frame_sizes)
+    runs = []
+    for algorithm in algorithms:
+        if use_stack_curve(algorithm, frame_sizes):
+            runs.append((_run_curve, algorithm, frame_sizes))
+        else:
+            runs.extend((_run_one, algorithm, frame_size)
+                        for frame_size in frame_sizes)
+
+    from concurrent.futures import ProcessPoolExecutor  # Slow to import; only needed here
+
+    workers = min(workers or os.cpu_count() or 1, len(runs)) or 1
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=initargs)
+    futures = [executor.submit(*run) for run in runs]
+    return executor, futures
+
+
+def compare(pages, algorithms=None, frame_sizes=range(1, 11), workers=None):
+    """Run every algorithm at every frame count and wait for the results
+
+    Returns a dict mapping (algorithm, frame_size) to the fault count.
+    """
+    executor, futures = start_comparison(pages, algorithms, frame_sizes, workers)
+    with executor:
+        return collect_results(futures)
+
+
+def collect_results(futures):
+    """Gather finished futures into {(algorithm, frame_size): faults}"""
+    results = {}
+    for future in futures:
+        for algorithm, frame_size, faults in future.result():
+            results[(algorithm, frame_size)] = faults
+    return results
+
+
+def fault_table(results, algorithms, frame_sizes):
+    """Rows of [frame_size, faults per algorithm...] for display"""
+    return [[frame_size] + [results[(algorithm, frame_size)] for algorithm in algorithms]
+            for frame_size in frame_sizes]
+
+
+def belady_anomalies(results, algorithm, frame_sizes):
+    """Frame counts where adding a frame increased the fault count"""
+    sizes = sorted(frame_sizes)
+    return [larger for smaller, larger in zip(sizes, sizes[1:])
+            if results[(algorithm, larger)] > results[(algorithm, smaller)]]
@@ -0,0 +1,224 @@
+"""Headless page replacement engine.
+
+This module has no Tk dependency so the same algorithms can drive the GUI
+step by step or replay long reference strings in a batch/worker process.
+"""
+import pickle
+import zlib
+from collections import namedtuple
+from itertools import islice
+
+from policies import get_policy
+from preprocess import iter_runs
+
+
+# One processed reference: `slot` is the frame that received the page on a
+# fault (-1 on a hit) and `replaced` is the evicted page (None if the frame
+# was empty or the reference was a hit).
+StepResult = namedtuple(
+    "StepResult", ["index", "page", "fault", "slot", "replaced"])
+
+SimulationResult = namedtuple(
+    "SimulationResult", ["algorithm", "frame_size", "faults", "hits", "steps"])
+
+
+class PageReplacementEngine:
+    """Runs one replacement policy over a reference string
+
+    The engine owns the frames; the policy from the registry in policies.py
+    only chooses which resident page to evict. Policies that need the
+    future index `pages` up front and report it to `progress` (see
+    policies.build_next_use).
+    """
+
+    def __init__(self, algorithm, frame_size, pages=None, progress=None):
+        policy_class = get_policy(algorithm)
+        if frame_size <= 0:
+            raise ValueError("Number of frames must be positive.")
+        if policy_class.needs_future and pages is None:
+            raise ValueError(f"{algorithm} needs the full page reference string.")
+
+        self.algorithm = algorithm
+        self.frame_size = frame_size
+        self.pages = pages
+        if policy_class.needs_future:
+            self.policy = policy_class(frame_size, pages, progress)
+        else:
+            self.policy = policy_class(frame_size, pages)
+        self.frames = [None] * frame_size
+        self.index = 0
+        self.page_faults = 0
+        self.hits = 0
+        self.collapse_repeats = False  # Make run() collapse runs of repeats
+
+        # Resident page -> frame index. Pages keep their frame until they
+        # are evicted, and frames fill in order, so while any are empty the
+        # next one is at len(_resident).
+        self._resident = {}
+
+    def step(self, page):
+        """Process one reference and return its StepResult"""
+        slot, replaced = self._step(page)
+
+        fault = slot >= 0
+        if fault:
+            self.page_faults += 1
+        else:
+            self.hits += 1
+
+        result = StepResult(self.index, page, fault, slot, replaced)
+        self.index += 1
+        return result
+
+    def step_run(self, page, count=1):
+        """Process `count` consecutive references to `page` as one step
+
+        Returns the StepResult of the first reference; the others are hits.
+        """
+        result = self.step(page)
+        if count > 1:
+            policy = self.policy
+            if policy.idempotent_hits:
+                policy.on_access(page, self.index + count - 2, True)
+            else:
+                for index in range(self.index, self.index + count - 1):
+                    policy.on_access(page, index, True)
+            self.index += count - 1
+            self.hits += count - 1
+        return result
+
+    def run(self, pages, limit=None):
+        """Process references without recording steps
+
+        Consumes at most `limit` references from the iterator `pages` and
+        returns how many were processed. Memory stays proportional to the
+        frame count, so long traces can be fed in chunks.
+        """
+        if limit is not None:
+            pages = islice(pages, limit)
+        if self.collapse_repeats:
+            return self.run_weighted(iter_runs(pages))
+
+        # Same as _step, with everything hoisted into locals
+        resident = self._resident
+        frames = self.frames
+        frame_size = self.frame_size
+        on_access = self.policy.on_access
+        choose_victim = self.policy.choose_victim
+        index = start = self.index
+        faults = 0
+        for page in pages:
+            if page in resident:
+                on_access(page, index, True)
+            else:
+                faults += 1
+                if len(resident) < frame_size:
+                    slot = len(resident)
+                else:
+                    slot = resident.pop(choose_victim(page, index))
+                resident[page] = slot
+                frames[slot] = page
+                on_access(page, index, False)
+            index += 1
+
+        self.index = index
+        processed = index - start
+        self.page_faults += faults
+        self.hits += processed - faults
+        return processed
+
+    def run_weighted(self, runs):
+        """Process (page, count) weighted steps, e.g. from preprocess.compact
+
+        Gives the same result as `count` references to each page in turn.
+        Returns the number of references processed.
+        """
+        resident = self._resident
+        frames = self.frames
+        frame_size = self.frame_size
+        on_access = self.policy.on_access
+        choose_victim = self.policy.choose_victim
+        idempotent_hits = self.policy.idempotent_hits
+        index = start = self.index
+        faults = 0
+        for page, count in runs:
+            if page in resident:
+                on_access(page, index, True)
+            else:
+                faults += 1
+                if len(resident) < frame_size:
+                    slot = len(resident)
+                else:
+                    slot = resident.pop(choose_victim(page, index))
+                resident[page] = slot
+                frames[slot] = page
+                on_access(page, index, False)
+            if count > 1:
+                # The rest of the run is hits
+                if idempotent_hits:
+                    on_access(page, index + count - 1, True)
+                else:
+                    for repeat in range(index + 1, index + count):
+                        on_access(page, repeat, True)
+            index += count
+
+        self.index = index
+        processed = index - start
+        self.page_faults += faults
+        self.hits += processed - faults
+        return processed
+
+    def stats(self):
+        """Fault and hit counts plus the policy's own counters"""
+        stats = {"faults": self.page_faults, "hits": self.hits}
+        stats.update(self.policy.stats())
+        return stats
+
+    def checkpoint(self):
+        """Compact binary snapshot of the run so far (see restore)
+
+        The reference string and the policy's static_state are not
+        included; they are the same for every point of the run.
+        """
+        state = (self.index, self.page_faults, self.hits, self.frames,
+                 self._resident, self.policy.get_state())
+        return zlib.compress(pickle.dumps(state, pickle.HIGHEST_PROTOCOL), 1)
+
+    def restore(self, blob):
+        """Return to the state saved by checkpoint() on this run"""
+        (self.index, self.page_faults, self.hits, frames,
+         self._resident, policy_state) = pickle.loads(zlib.decompress(blob))
+        self.frames[:] = frames  # Callers may hold on to the frames list
+        self.policy.set_state(policy_state)
+
+    def _step(self, page):
+        """Process one reference, returning (slot, replaced)"""
+        resident = self._resident
+        if page in resident:
+            self.policy.on_access(page, self.index, True)
+            return -1, None
+
+        replaced = None
+        if len(resident) < self.frame_size:
+            slot = len(resident)
+        else:
+            replaced = self.policy.choose_victim(page, self.index)
+            slot = resident.pop(replaced)
+
+        resident[page] = slot
+        self.frames[slot] = page
+        self.policy.on_access(page, self.index, False)
+        return slot, replaced
+
+
+def simulate(pages, frame_size, algorithm, record_steps=True):
+    """Run a whole reference string and return a SimulationResult"""
+    engine = PageReplacementEngine(algorithm, frame_size, pages)
+    steps = []
+    if record_steps:
+        for page in pages:
+            steps.append(engine.step(page))
+    else:
+        engine.run(iter(pages))
+    return SimulationResult(algorithm, frame_size, engine.page_faults,
+                            engine.hits, steps)
@@ -0,0 +1,96 @@
+"""Compact storage for the per-step frame states shown in the GUI.
+
+At most one frame changes per step, so the history stores one delta per
+step (the frame that was loaded and its page) in typed arrays, plus a full
+snapshot of every frame each `snapshot_interval` steps. Any step's frame
+states are rebuilt on demand from the nearest snapshot.
+
+A step may stand for several references when repeats are collapsed into
+weighted steps; the history keeps where each step starts in the reference
+string.
+
+Pages are stored as dense IDs from a preprocess.Interner, so any page
+number, up to unsigned 64-bit addresses, fits the int64 arrays.
+"""
+from array import array
+
+from preprocess import Interner
+
+
+EMPTY = -1  # Sentinel for an empty frame
+DEFAULT_SNAPSHOT_INTERVAL = 256
+
+
+class FrameHistory:
+    """Frame states of every step, stored as deltas plus snapshots"""
+
+    def __init__(self, frame_count, snapshot_interval=DEFAULT_SNAPSHOT_INTERVAL):
+        self.frame_count = frame_count
+        self.snapshot_interval = snapshot_interval
+        self.slots = array("i")  # Frame loaded at each step, -1 on a hit
+        self.interner = Interner()
+        self.pages = array("q")  # ID of the page loaded at each step
+        self.snapshots = array("q")  # Flattened states every interval steps
+        self.current = array("q", [EMPTY]) * frame_count
+        self.starts = array("q")  # First reference of each step
+        self.references = 0  # References covered by all steps
+
+        # Last rebuilt state, so scanning columns in order stays cheap
+        self._cached_step = -1
+        self._cached_state = None
+
+    def __len__(self):
+        return len(self.slots)
+
+    def append(self, slot, page, count=1):
+        """Record one step of `count` references; `slot` is -1 when no frame changed"""
+        step = len(self.slots)
+        self.starts.append(self.references)
+        self.references += count
+        self.slots.append(slot)
+        page_id = self.interner.intern(page) if slot >= 0 else EMPTY
+        self.pages.append(page_id)
+        if slot >= 0:
+            self.current[slot] = page_id
+        if step % self.snapshot_interval == 0:
+            self.snapshots.extend(self.current)
+
+    def state_at(self, step):
+        """Page IDs held by each frame (EMPTY for empty frames) after `step`
+
+        page() turns an ID back into its page. The returned array is reused
+        by the next call; copy it to keep it.
+        """
+        if not 0 <= step < len(self.slots):
+            raise IndexError("step out of range")
+
+        cached = self._cached_step
+        if cached <= step and step - cached < self.snapshot_interval and cached >= 0:
+            # Roll the cached state forward
+            state = self._cached_state
+            start = cached + 1
+        else:
+            # Start from the nearest snapshot at or before `step`
+            base = step - step % self.snapshot_interval
+            offset = (base // self.snapshot_interval) * self.frame_count
+            state = self.snapshots[offset:offset + self.frame_count]
+            start = base + 1
+
+        slots, pages = self.slots, self.pages
+        for i in range(start, step + 1):
+            if slots[i] >= 0:
+                state[slots[i]] = pages[i]
+
+        self._cached_step = step
+        self._cached_state = state
+        return state
+
+    def page(self, page_id):
+        """Page number of an ID from state_at"""
+        return self.interner.addresses[page_id]
+
+    def references_at(self, step):
+        """(first reference, reference count) of `step`"""
+        start = self.starts[step]
+        end = self.starts[step + 1] if step + 1 < len(self.starts) else self.references
+        return start, end - start
@@ -1,6 +1,54 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
 import random
+import sys
+from array import array
+from time import perf_counter_ns
+
+# The Compare and Analyze windows (process pools, charts) are imported on
+# first use so they don't slow down startup
+from checkpoints import CheckpointStore
+from engine import PageReplacementEngine
+from history import EMPTY, FrameHistory
+from policies import get_policy, policy_names
+from preprocess import run_length
+from profiler import PhaseProfiler
+from runner import EngineBuilder, EngineWorker
+from simlog import DEFAULT_MAX_LINES, LogBuffer
+from traces import TraceFormatError, load_trace
+
+# Input limits for the animated view
+MAX_FRAMES = 10
+MAX_PAGES = 50
+MAX_PAGE_RANGE = 10
+
+# Input limits for large-trace mode, which skips the per-step animation
+LARGE_MAX_FRAMES = 100000
+LARGE_MAX_PAGES = 100000000
+LARGE_MAX_PAGE_RANGE = 1000000000
+LARGE_CHUNK = 50000  # references generated per event loop tick
+LOG_PREVIEW_PAGES = 50  # pages echoed to the log before truncating
+LOG_FLUSH_MS = 100  # how often buffered log lines reach the widget
+COMPARE_POLL_MS = 50  # how often a running comparison is checked
+ANALYSIS_POLL_MS = 50  # how often a running workload analysis is checked
+ANALYSIS_DEFAULT_ALGORITHM = "LRU"  # analyzed when no algorithm has been run yet
+WORKER_POLL_MS = 33  # how often a background run's progress is shown (~30 fps)
+PROFILE_REFRESH_NS = 250000000  # how often the profiling bar is redrawn
+ALGO_BUTTONS_PER_ROW = 4
+STARTUP_PROBE_FLAG = "--startup-probe"  # quit as soon as the window is ready
+
+# Page Reference Sequence geometry
+SEQ_BOX_SIZE = 40
+SEQ_PADDING = 5
+SEQ_X_START = 10
+SEQ_Y_START = 5
+SEQ_LOOKAHEAD = 3  # upcoming pages kept in view right of the current one
+
+# Memory Frames grid geometry
+CELL_SIZE = 40
+CELL_PADDING = 10
+GRID_X_START = 50  # Leave space for frame numbers on the left
+GRID_Y_START = 20
 
 
 class PageReplacementSimulator:
@@ -14,18 +62,45 @@ class PageReplacementSimulator:
         self.generated_pages = []
         self.current_index = 0
         self.frames = []
-        self.frame_history = []  # Track history of each frame's state
+        self.frame_history = None  # Track history of each frame's state
         self.page_faults = 0
+        self.engine = None
         self.animation_speed = 1.0
         self.animation_id = None
         self.is_animating = False
+        self.large_mode = tk.BooleanVar(value=False)
+        self.run_large = False  # Large-trace mode of the selected run
+        self.page_iter = None  # Engine input in large-trace mode
+        self.checkpoints = None  # CheckpointStore of a large-trace run
+        self.worker = None  # EngineWorker advancing a large-trace run
+        self.worker_done = None  # Called on the Tk thread when it finishes
+        self.worker_poll_id = None
+        self.builder = None  # EngineBuilder indexing a large OPT run
+        self.builder_poll_id = None
+        self.page_seed = None  # Seed of the last generated sequence
+        self.log = LogBuffer()
+        self.log_flush_id = None
+        self.log_widget_lines = 0
+        self.compare_executor = None
+        self.compare_futures = []
+        self.algorithm = None  # Name of the selected algorithm
+        self.analysis_executor = None
+        self.analysis_future = None
+        self.profile_mode = tk.BooleanVar(value=False)
+        self.profiler = None  # PhaseProfiler while "Profile steps" is ticked
+        self.profile_shown = 0  # perf_counter_ns() of the last profile redraw
+        self.compact_mode = tk.BooleanVar(value=False)
 
         # Setup UI components
         self.setup_ui()
+        self.reset_sequence_canvas()
+        self.reset_frames_canvas()
 
         # Set defaults
         self.frames_entry.insert(0, "3")
         self.pages_entry.insert(0, "10")
+        self.range_entry.insert(0, "10")
+        self.log_cap_entry.insert(0, str(DEFAULT_MAX_LINES))
 
     def setup_ui(self):
         # Create main frames
@@ -53,10 +128,44 @@ class PageReplacementSimulator:
         self.pages_entry = ttk.Entry(settings_frame, width=10)
         self.pages_entry.grid(row=1, column=1, padx=5, pady=5)
 
+        # Page range input (distinct pages are 0 .. range-1)
+        ttk.Label(settings_frame, text="Page Range:").grid(
+            row=2, column=0, sticky=tk.W, pady=5)
+        self.range_entry = ttk.Entry(settings_frame, width=10)
+        self.range_entry.grid(row=2, column=1, padx=5, pady=5)
+
+        # Seed input; blank picks a new seed, which is shown in the log
+        ttk.Label(settings_frame, text="Seed:").grid(
+            row=3, column=0, sticky=tk.W, pady=5)
+        self.seed_entry = ttk.Entry(settings_frame, width=10)
+        self.seed_entry.grid(row=3, column=1, padx=5, pady=5)
+
+        # Large-trace mode toggle
+        ttk.Checkbutton(settings_frame, text="Large trace mode",
+                        variable=self.large_mode).grid(
+            row=4, column=0, columnspan=2, sticky=tk.W)
+
+        # Per-phase timing of each step, shown above the status bar
+        ttk.Checkbutton(settings_frame, text="Profile steps",
+                        variable=self.profile_mode,
+                        command=self.toggle_profiling).grid(
+            row=5, column=0, columnspan=2, sticky=tk.W)
+
+        # Collapse runs of repeated references into one weighted step
+        ttk.Checkbutton(settings_frame, text="Compact repeats",
+                        variable=self.compact_mode,
+                        command=self.toggle_compaction).grid(
+            row=6, column=0, columnspan=2, sticky=tk.W)
+
         # Generate button
         generate_btn = ttk.Button(
             settings_frame, text="Generate Pages", command=self.generate_pages)
-        generate_btn.grid(row=2, column=0, columnspan=2, sticky=tk.EW, pady=10)
+        generate_btn.grid(row=7, column=0, columnspan=2, sticky=tk.EW, pady=(10, 0))
+
+        # Load a reference string from a trace file instead
+        load_btn = ttk.Button(
+            settings_frame, text="Load Trace...", command=self.load_trace_file)
+        load_btn.grid(row=8, column=0, columnspan=2, sticky=tk.EW, pady=5)
 
         # Animation controls (middle)
         anim_frame = ttk.Frame(self.control_frame, padding=(20, 0, 0, 0))
@@ -79,17 +188,26 @@ class PageReplacementSimulator:
         algo_buttons_frame = ttk.Frame(algo_frame)
         algo_buttons_frame.pack(fill=tk.X, pady=5)
 
-        self.fifo_btn = ttk.Button(
-            algo_buttons_frame, text="FIFO", command=self.run_fifo)
-        self.fifo_btn.pack(side=tk.LEFT, padx=5)
-
-        self.lru_btn = ttk.Button(
-            algo_buttons_frame, text="LRU", command=self.run_lru)
-        self.lru_btn.pack(side=tk.LEFT, padx=5)
-
-        self.opt_btn = ttk.Button(
-            algo_buttons_frame, text="OPT", command=self.run_opt)
-        self.opt_btn.pack(side=tk.LEFT, padx=5)
+        # One button per registered policy, ALGO_BUTTONS_PER_ROW to a row
+        self.algorithm_buttons = {}
+        for i, name in enumerate(policy_names()):
+            button = ttk.Button(algo_buttons_frame, text=name,
+                                command=lambda name=name: self.run_algorithm(name))
+            button.grid(row=i // ALGO_BUTTONS_PER_ROW, column=i % ALGO_BUTTONS_PER_ROW,
+                        padx=5, pady=2)
+            self.algorithm_buttons[name] = button
+
+        i = len(self.algorithm_buttons)
+        self.compare_btn = ttk.Button(
+            algo_buttons_frame, text="Compare", command=self.run_comparison)
+        self.compare_btn.grid(row=i // ALGO_BUTTONS_PER_ROW, column=i % ALGO_BUTTONS_PER_ROW,
+                              padx=5, pady=2)
+
+        i += 1
+        self.analyze_btn = ttk.Button(
+            algo_buttons_frame, text="Analyze", command=self.run_analysis)
+        self.analyze_btn.grid(row=i // ALGO_BUTTONS_PER_ROW, column=i % ALGO_BUTTONS_PER_ROW,
+                              padx=5, pady=2)
 
         # Control buttons
         ctrl_buttons_frame = ttk.Frame(algo_frame)
@@ -107,14 +225,38 @@ class PageReplacementSimulator:
             ctrl_buttons_frame, text="Reset", command=self.reset_simulation)
         self.reset_btn.pack(side=tk.LEFT, padx=5)
 
+        # Fast-forward controls
+        jump_frame = ttk.Frame(algo_frame)
+        jump_frame.pack(fill=tk.X, pady=5)
+
+        self.run_end_btn = ttk.Button(
+            jump_frame, text="Run to End", command=self.run_to_end, state=tk.DISABLED)
+        self.run_end_btn.pack(side=tk.LEFT, padx=5)
+
+        ttk.Label(jump_frame, text="Step:").pack(side=tk.LEFT, padx=(5, 0))
+        self.jump_entry = ttk.Entry(jump_frame, width=8)
+        self.jump_entry.pack(side=tk.LEFT, padx=5)
+
+        self.jump_btn = ttk.Button(
+            jump_frame, text="Jump", command=self.jump_to_step, state=tk.DISABLED)
+        self.jump_btn.pack(side=tk.LEFT, padx=5)
+
         # Page sequence display
         self.sequence_frame = ttk.LabelFrame(
             self.main_frame, text="Page Reference Sequence", padding=10)
         self.sequence_frame.pack(fill=tk.X, pady=(0, 10))
 
+        # The scrollbar moves a window over the sequence instead of
+        # scrolling the canvas, so it works for traces of any length
+        self.sequence_scroll = ttk.Scrollbar(
+            self.sequence_frame, orient=tk.HORIZONTAL, command=self.scroll_sequence)
+        self.sequence_scroll.pack(side=tk.BOTTOM, fill=tk.X)
+
         self.sequence_canvas = tk.Canvas(self.sequence_frame, height=50, bg="white", highlightthickness=1,
                                          highlightbackground="gray")
         self.sequence_canvas.pack(fill=tk.X, pady=5)
+        self.sequence_canvas.bind(
+            "<Configure>", lambda event: self.show_sequence_from(self.sequence_first))
 
         # Main content area (split into two)
         content_frame = ttk.Frame(self.main_frame)
@@ -140,14 +282,29 @@ class PageReplacementSimulator:
                                        xscrollcommand=x_scroll.set)
         self.frames_canvas.pack(fill=tk.BOTH, expand=True, pady=5)
 
-        # Configure scrollbar
-        x_scroll.config(command=self.frames_canvas.xview)
+        # Configure scrollbar; only the columns in view are drawn, so
+        # scrolling and resizing both refresh them
+        x_scroll.config(command=self.scroll_frames)
+        self.frames_canvas.bind(
+            "<Configure>", lambda event: self.render_visible_columns())
 
         # Simulation log (right)
         self.log_frame = ttk.LabelFrame(
             content_frame, text="Simulation Log", padding=10)
         self.log_frame.pack(side=tk.RIGHT, fill=tk.BOTH, expand=True)
 
+        # Log options: line cap and streaming to a file
+        log_options = ttk.Frame(self.log_frame)
+        log_options.pack(fill=tk.X, pady=(0, 5))
+
+        ttk.Label(log_options, text="Max lines:").pack(side=tk.LEFT)
+        self.log_cap_entry = ttk.Entry(log_options, width=8)
+        self.log_cap_entry.pack(side=tk.LEFT, padx=5)
+
+        self.log_file_btn = ttk.Button(
+            log_options, text="Log to File...", command=self.toggle_log_file)
+        self.log_file_btn.pack(side=tk.LEFT, padx=5)
+
         # Add scrollbar to log
         log_scroll = ttk.Scrollbar(self.log_frame)
         log_scroll.pack(side=tk.RIGHT, fill=tk.Y)
@@ -164,6 +321,105 @@ class PageReplacementSimulator:
             self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(side=tk.BOTTOM, fill=tk.X)
 
+        # Profiling bar, packed above the status bar while profiling
+        self.profile_var = tk.StringVar()
+        self.profile_bar = ttk.Label(
+            self.root, textvariable=self.profile_var, relief=tk.SUNKEN, anchor=tk.W)
+
+    def write_log(self, text):
+        """Add text to the Simulation Log
+
+        The text goes into the ring buffer (and the log file, if any) and
+        reaches the widget on the next batched flush.
+        """
+        self.log.write(text)
+        if self.log_flush_id is None:
+            self.log_flush_id = self.root.after(LOG_FLUSH_MS, self.flush_log)
+
+    def clear_log(self):
+        """Empty the Simulation Log"""
+        self.log.clear()
+        self.log_text.delete(1.0, tk.END)
+        self.log_widget_lines = 0
+
+    def flush_log(self):
+        """Move buffered log lines into the widget, keeping it capped"""
+        self.log_flush_id = None
+        lines, overflowed = self.log.take_pending()
+        if overflowed:
+            # More lines arrived than the cap: show only the newest ones
+            self.log_text.delete(1.0, tk.END)
+            self.log_widget_lines = 0
+        elif not lines:
+            return
+        if self.profiler is not None:
+            start = perf_counter_ns()
+
+        self.log_text.insert(tk.END, "".join(lines))
+        self.log_widget_lines += len(lines)
+
+        excess = self.log_widget_lines - self.log.max_lines
+        if excess > 0:
+            self.log_text.delete("1.0", f"{excess + 1}.0")
+            self.log_widget_lines -= excess
+        self.log_text.see(tk.END)
+        if self.profiler is not None:
+            self.profiler.record("log flush", perf_counter_ns() - start, len(lines) or 1)
+
+    def toggle_profiling(self):
+        """Start or stop timing the phases of each step"""
+        if self.profile_mode.get():
+            self.profiler = PhaseProfiler()
+            self.profile_var.set("Profiling: waiting for steps")
+            self.profile_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        else:
+            self.profiler = None
+            self.profile_bar.pack_forget()
+
+    def toggle_compaction(self):
+        """Apply "Compact repeats" to the run in progress from its next step"""
+        if self.engine is not None:
+            self.engine.collapse_repeats = self.compact_mode.get()
+
+    def step_count(self, index, stop):
+        """References the step starting at `index` covers (ending by `stop`)
+
+        With "Compact repeats" ticked a step takes the whole run of
+        references equal to the one at `index`; they are all hits after
+        the first.
+        """
+        if not self.compact_mode.get():
+            return 1
+        return run_length(self.generated_pages, index, stop)
+
+    def show_profile(self, force=False):
+        """Redraw the profiling bar, at most every PROFILE_REFRESH_NS"""
+        now = perf_counter_ns()
+        if force or now - self.profile_shown >= PROFILE_REFRESH_NS:
+            self.profile_shown = now
+            self.profile_var.set(self.profiler.format_summary())
+
+    def toggle_log_file(self):
+        """Start or stop streaming the full log to a file"""
+        if self.log.file is not None:
+            self.log.close_file()
+            self.log_file_btn.config(text="Log to File...")
+            self.status_var.set("Stopped logging to file")
+            return
+
+        path = filedialog.asksaveasfilename(
+            title="Stream Simulation Log To", defaultextension=".log",
+            filetypes=[("Log files", "*.log"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            self.log.open_file(path)
+        except OSError as e:
+            messagebox.showerror("Log File", f"Could not open log file:\n{e}")
+            return
+        self.log_file_btn.config(text="Stop Logging")
+        self.status_var.set(f"Logging to {path}")
+
     def update_speed(self, value):
         """Update animation speed"""
         self.animation_speed = float(value)
@@ -171,270 +427,569 @@ class PageReplacementSimulator:
 
     def generate_pages(self):
         """Generate random page reference sequence"""
+        large = self.large_mode.get()
+        max_pages = LARGE_MAX_PAGES if large else MAX_PAGES
+        max_range = LARGE_MAX_PAGE_RANGE if large else MAX_PAGE_RANGE
         try:
             num_pages = int(self.pages_entry.get())
-            if num_pages <= 0 or num_pages > 50:
-                messagebox.showerror(
-                    "Invalid Input", "Number of pages must be between 1 and 50.")
-                return
-
-            # Generate pages between 0 and 9
-            self.generated_pages = [random.randint(
-                0, 9) for _ in range(num_pages)]
-            self.draw_page_sequence()
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(
-                tk.END, f"Generated Pages: {' '.join(map(str, self.generated_pages))}\n\n")
-            self.status_var.set(
-                f"Generated {num_pages} pages. Select an algorithm to run.")
+            page_range = int(self.range_entry.get())
+        except ValueError:
+            messagebox.showerror(
+                "Invalid Input", "Please enter a valid number for pages.")
+            return
 
-            # Enable buttons
-            self.fifo_btn.config(state=tk.NORMAL)
-            self.lru_btn.config(state=tk.NORMAL)
-            self.opt_btn.config(state=tk.NORMAL)
+        if num_pages <= 0 or num_pages > max_pages:
+            messagebox.showerror(
+                "Invalid Input", f"Number of pages must be between 1 and {max_pages}.")
+            return
+        if page_range <= 0 or page_range > max_range:
+            messagebox.showerror(
+                "Invalid Input", f"Page range must be between 1 and {max_range}.")
+            return
 
+        seed_text = self.seed_entry.get().strip()
+        try:
+            seed = int(seed_text) if seed_text else random.randrange(2**32)
         except ValueError:
             messagebox.showerror(
-                "Invalid Input", "Please enter a valid number for pages.")
+                "Invalid Input", "Seed must be a whole number or left blank.")
+            return
 
-    def draw_page_sequence(self):
-        """Draw the page sequence on canvas"""
-        self.sequence_canvas.delete("all")
+        self.reset_simulation()
+        self.set_algorithm_buttons(tk.DISABLED)
+        self.release_pages()
 
-        box_size = 40
-        padding = 5
-        x_start = 10
-
-        # Draw each page box
-        for i, page in enumerate(self.generated_pages):
-            x = x_start + i * (box_size + padding)
-
-            # Check if we need to show ellipsis for long sequences
-            if x > self.sequence_canvas.winfo_width() - 2*box_size and i < len(self.generated_pages) - 1:
-                self.sequence_canvas.create_text(
-                    x + 10, box_size/2, text="...", font=("Arial", 12, "bold"))
-
-                # Draw the last page after ellipsis
-                last_x = x + 30
-                self.sequence_canvas.create_rectangle(last_x, 5, last_x + box_size, 5 + box_size,
-                                                      fill="#e0e0e0", outline="black", tags=f"page{len(self.generated_pages)-1}")
-                self.sequence_canvas.create_text(last_x + box_size/2, 5 + box_size/2,
-                                                 text=str(self.generated_pages[-1]), tags=f"page{len(self.generated_pages)-1}")
-                break
-
-            # Draw page box
-            self.sequence_canvas.create_rectangle(x, 5, x + box_size, 5 + box_size,
-                                                  fill="#e0e0e0", outline="black", tags=f"page{i}")
-            self.sequence_canvas.create_text(
-                x + box_size/2, 5 + box_size/2, text=str(page), tags=f"page{i}")
+        # The same seed, count and range always give the same sequence
+        self.page_seed = seed
+        rng = random.Random(seed)
 
-    def highlight_current_page(self, index):
-        """Highlight current page in sequence"""
-        # Remove previous highlights
-        self.sequence_canvas.delete("highlight")
+        if not large:
+            # Generate pages between 0 and page_range - 1
+            self.generated_pages = [rng.randrange(
+                page_range) for _ in range(num_pages)]
+            self.finish_generation()
+            return
+
+        # Large traces are stored as a packed array and generated in
+        # chunks so the window keeps handling events
+        self.generated_pages = array("q")
+        self.generate_chunk(num_pages, range(page_range), rng)
 
-        if index >= len(self.generated_pages):
+    def generate_chunk(self, num_pages, universe, rng):
+        """Generate the next chunk of a large page reference sequence"""
+        count = min(LARGE_CHUNK, num_pages - len(self.generated_pages))
+        self.generated_pages.extend(rng.choices(universe, k=count))
+
+        if len(self.generated_pages) < num_pages:
+            self.status_var.set(
+                f"Generating pages: {len(self.generated_pages)}/{num_pages}")
+            self.animation_id = self.root.after(
+                1, self.generate_chunk, num_pages, universe, rng)
             return
 
-        box_size = 40
-        padding = 5
-        x_start = 10
-        x = x_start + index * (box_size + padding)
+        self.animation_id = None
+        self.finish_generation()
+
+    def load_trace_file(self):
+        """Load the page reference sequence from a trace file
+
+        Binary traces stay memory-mapped; text and CSV traces are parsed
+        into a packed array. Traces longer than the animated view allows
+        switch on large-trace mode.
+        """
+        path = filedialog.askopenfilename(
+            title="Load Page Trace",
+            filetypes=[("Trace files", "*.txt *.csv *.bin *.trace *.dat"),
+                       ("All files", "*.*")])
+        if not path:
+            return
 
-        # If we're showing ellipsis and this is the last page
-        if x > self.sequence_canvas.winfo_width() - 2*box_size and index < len(self.generated_pages) - 1:
-            # Don't highlight
+        try:
+            pages = load_trace(path)
+        except (OSError, TraceFormatError) as e:
+            messagebox.showerror("Load Trace", f"Could not load trace:\n{e}")
+            return
+        if not len(pages):
+            if hasattr(pages, "close"):
+                pages.close()
+            messagebox.showerror("Load Trace", "The trace file is empty.")
             return
-        elif index == len(self.generated_pages) - 1 and x > self.sequence_canvas.winfo_width() - 2*box_size:
-            # Highlight the last page shown after ellipsis
-            x = x_start + (self.sequence_canvas.winfo_width() - 2 *
-                           box_size) // (box_size + padding) + 30
 
-        # Create highlight rectangle
-        self.sequence_canvas.create_rectangle(x-2, 3, x+box_size+2, 7+box_size,
-                                              outline="red", width=2, tags="highlight")
+        self.reset_simulation()
+        self.release_pages()
+        if len(pages) > MAX_PAGES:
+            self.large_mode.set(True)
+        self.generated_pages = pages
+        self.page_seed = None
+        self.finish_generation("Loaded")
+
+    def release_pages(self):
+        """Close a memory-mapped trace before the sequence is replaced"""
+        if hasattr(self.generated_pages, "close"):
+            self.generated_pages.close()
+        self.generated_pages = []
 
-    def draw_frames(self, highlight_index=-1):
-        """Draw memory frames in a grid format"""
+    def finish_generation(self, action="Generated"):
+        """Show the new sequence and enable the algorithm buttons"""
+        self.draw_page_sequence()
+        self.clear_log()
+        if self.page_seed is not None:
+            self.write_log(f"Seed: {self.page_seed}\n")
+        self.write_log(
+            f"{action} Pages: {format_pages(self.generated_pages)}\n\n")
+        self.status_var.set(
+            f"{action} {len(self.generated_pages)} pages. Select an algorithm to run.")
+
+        # Enable buttons
+        self.set_algorithm_buttons(tk.NORMAL)
+
+    def set_algorithm_buttons(self, state):
+        """Enable or disable the algorithm buttons"""
+        for button in self.algorithm_buttons.values():
+            button.config(state=state)
+
+    def reset_sequence_canvas(self):
+        """Clear the Page Reference Sequence canvas and its box items"""
+        self.sequence_canvas.delete("all")
+        self.sequence_boxes = []  # (rectangle, text) per visible position
+        self.sequence_first = 0  # Index of the leftmost visible page
+        self.sequence_highlight_index = None
+        self.sequence_highlight = self.sequence_canvas.create_rectangle(
+            0, 0, 0, 0, outline="red", width=2, state=tk.HIDDEN, tags="highlight")
+
+    def draw_page_sequence(self):
+        """Draw the page sequence on canvas
+
+        The view is windowed: only the boxes that fit in the canvas exist,
+        and scrolling relabels them, so any sequence length costs the same.
+        """
+        self.reset_sequence_canvas()
+        self.render_sequence()
+
+    def visible_page_count(self):
+        """Number of page boxes that fit in the sequence canvas"""
+        width = self.sequence_canvas.winfo_width() - SEQ_X_START
+        return max(1, int(width // (SEQ_BOX_SIZE + SEQ_PADDING)))
+
+    def scroll_sequence(self, *args):
+        """Scrollbar callback: move the window over the page sequence"""
+        total = len(self.generated_pages)
+        if args[0] == "moveto":
+            first = int(float(args[1]) * total)
+        else:
+            amount = int(args[1])
+            if args[2] == "pages":
+                amount *= self.visible_page_count()
+            first = self.sequence_first + amount
+        self.show_sequence_from(first)
+
+    def show_sequence_from(self, first):
+        """Scroll the sequence view so page `first` is leftmost"""
+        total = len(self.generated_pages)
+        self.sequence_first = max(0, min(first, total - self.visible_page_count()))
+        self.render_sequence()
+
+    def render_sequence(self):
+        """Label the visible boxes and place the highlight"""
+        canvas = self.sequence_canvas
+        step = SEQ_BOX_SIZE + SEQ_PADDING
+        total = len(self.generated_pages)
+        first = self.sequence_first
+        count = max(0, min(self.visible_page_count(), total - first))
+
+        while len(self.sequence_boxes) < count:
+            x = SEQ_X_START + len(self.sequence_boxes) * step
+            rect = canvas.create_rectangle(x, SEQ_Y_START, x + SEQ_BOX_SIZE, SEQ_Y_START + SEQ_BOX_SIZE,
+                                           fill="#e0e0e0", outline="black")
+            text = canvas.create_text(x + SEQ_BOX_SIZE/2, SEQ_Y_START + SEQ_BOX_SIZE/2)
+            self.sequence_boxes.append((rect, text))
+        canvas.tag_raise(self.sequence_highlight)
+
+        for position, (rect, text) in enumerate(self.sequence_boxes):
+            if position < count:
+                canvas.itemconfigure(rect, state=tk.NORMAL)
+                canvas.itemconfigure(
+                    text, text=str(self.generated_pages[first + position]), state=tk.NORMAL)
+            else:
+                canvas.itemconfigure(rect, state=tk.HIDDEN)
+                canvas.itemconfigure(text, state=tk.HIDDEN)
+
+        index = self.sequence_highlight_index
+        if index is not None and first <= index < first + count:
+            x = SEQ_X_START + (index - first) * step
+            canvas.coords(self.sequence_highlight, x - 2, SEQ_Y_START - 2,
+                          x + SEQ_BOX_SIZE + 2, SEQ_Y_START + SEQ_BOX_SIZE + 2)
+            canvas.itemconfigure(self.sequence_highlight, state=tk.NORMAL)
+        else:
+            canvas.itemconfigure(self.sequence_highlight, state=tk.HIDDEN)
+
+        if total:
+            self.sequence_scroll.set(first / total, (first + count) / total)
+        else:
+            self.sequence_scroll.set(0, 1)
+
+    def highlight_current_page(self, index):
+        """Highlight current page in sequence, scrolling it into view"""
+        if not 0 <= index < len(self.generated_pages):
+            return
+
+        self.sequence_highlight_index = index
+        visible = self.visible_page_count()
+        lookahead = min(SEQ_LOOKAHEAD, visible - 1)
+        if index < self.sequence_first or index >= self.sequence_first + visible - lookahead:
+            # Keep a few upcoming pages visible to the right of the current one
+            self.show_sequence_from(index - visible + 1 + lookahead)
+        else:
+            self.render_sequence()
+
+    def clear_sequence_highlight(self):
+        """Remove the highlight and scroll the sequence back to the start"""
+        self.sequence_highlight_index = None
+        self.show_sequence_from(0)
+
+    def reset_frames_canvas(self):
+        """Clear the Memory Frames canvas and its recycled column items"""
         self.frames_canvas.delete("all")
+        self.frames_canvas.xview_moveto(0)
+        self.frame_columns = {}  # Step index -> items of a visible column
+        self.free_columns = []  # Hidden column items ready for reuse
+        self.highlight_cell = None  # (step index, frame number)
+        self.grid_labels_drawn = False
+
+    def draw_frames(self, highlight_index=-1):
+        """Draw memory frames in a grid format
 
+        The grid is virtualized: only the columns inside the current view
+        exist on the canvas, so each step costs the same however long the
+        history grows.
+        """
         if not self.frames:
             return
 
-        # Calculate cell dimensions
-        cell_size = 40
-        padding = 10
-        x_start = 50  # Leave space for frame numbers on the left
-        y_start = 20
+        step = CELL_SIZE + CELL_PADDING
+        columns = len(self.frame_history) if self.frame_history else 0
 
         # Calculate total width needed
-        total_width = x_start + \
-            (len(self.frame_history[0])
-             if self.frame_history else 0) * (cell_size + padding)
-        total_height = y_start + (len(self.frames) + 1) * (cell_size + padding)
+        total_width = GRID_X_START + columns * step
+        total_height = GRID_Y_START + (len(self.frames) + 1) * step
 
         # Configure canvas scrolling
         self.frames_canvas.configure(scrollregion=(
             0, 0, total_width + 50, total_height + 20))
 
-        # Draw the current sequence at the top
-        self.frames_canvas.create_text(x_start - 30, y_start + cell_size/2,
-                                       text="Ref:", anchor=tk.W, font=("Arial", 10, "bold"))
+        if not self.grid_labels_drawn:
+            self.draw_grid_labels()
 
-        for i in range(self.current_index + 1):
-            x = x_start + i * (cell_size + padding)
-            page = self.generated_pages[i]
-            # Draw reference string value
-            self.frames_canvas.create_text(x + cell_size/2, y_start + cell_size/2,
-                                           text=str(page), font=("Arial", 12))
+        # Highlight the replaced frame in the newest column only
+        self.set_frame_highlight(
+            (columns - 1, highlight_index) if highlight_index >= 0 else None)
 
-        # Draw frame states
-        for frame_num in range(len(self.frames)):
-            y = y_start + (frame_num + 1) * (cell_size + padding)
+        # Auto-scroll to keep the newest column at the right edge
+        right = GRID_X_START + columns * step + CELL_PADDING
+        left = right - self.frames_canvas.winfo_width()
+        self.frames_canvas.xview_moveto(max(0, left / (total_width + 50)))
 
-            # Draw frame number on the left
-            self.frames_canvas.create_text(x_start - 30, y + cell_size/2,
-                                           text=f"F{frame_num}", anchor=tk.W, font=("Arial", 10, "bold"))
+        self.render_visible_columns()
 
-            # Draw historical states for this frame
-            history = self.get_frame_history(frame_num)
-            for i, value in enumerate(history):
-                x = x_start + i * (cell_size + padding)
+    def draw_grid_labels(self):
+        """Draw the Ref/frame number labels on the left of the grid"""
+        step = CELL_SIZE + CELL_PADDING
+        self.frames_canvas.create_text(GRID_X_START - 30, GRID_Y_START + CELL_SIZE/2,
+                                       text="Ref:", anchor=tk.W, font=("Arial", 10, "bold"))
+        for frame_num in range(len(self.frames)):
+            y = GRID_Y_START + (frame_num + 1) * step
+            self.frames_canvas.create_text(GRID_X_START - 30, y + CELL_SIZE/2,
+                                           text=f"F{frame_num}", anchor=tk.W, font=("Arial", 10, "bold"))
+        self.grid_labels_drawn = True
 
-                # Draw cell
-                fill_color = "#ff9999" if i == self.current_index and frame_num == highlight_index else "#e0e0ff"
-                self.frames_canvas.create_rectangle(x, y, x + cell_size, y + cell_size,
-                                                    fill=fill_color, outline="black")
+    def scroll_frames(self, *args):
+        """Scroll the Memory Frames canvas and draw the columns now in view"""
+        self.frames_canvas.xview(*args)
+        self.render_visible_columns()
 
-                # Draw value
-                if value is not None:
-                    self.frames_canvas.create_text(x + cell_size/2, y + cell_size/2,
-                                                   text=str(value), font=("Arial", 12))
+    def render_visible_columns(self):
+        """Make sure exactly the columns inside the view are drawn"""
+        if not self.frames or not self.frame_history:
+            return
 
-        # Auto-scroll to show the current step
-        if self.current_index > 0:
-            x_view = (self.current_index * (cell_size + padding)) / total_width
-            self.frames_canvas.xview_moveto(max(0, x_view - 0.7))
+        canvas = self.frames_canvas
+        step = CELL_SIZE + CELL_PADDING
+        columns = len(self.frame_history)
+        left = canvas.canvasx(0)
+        right = canvas.canvasx(canvas.winfo_width())
+        first = max(0, int((left - GRID_X_START) // step))
+        last = min(columns - 1, int((right - GRID_X_START) // step))
+
+        # Recycle columns that scrolled out of view
+        for col in [c for c in self.frame_columns if c < first or c > last]:
+            items = self.frame_columns.pop(col)
+            for item in items:
+                canvas.itemconfigure(item, state=tk.HIDDEN)
+            self.free_columns.append(items)
+
+        for col in range(first, last + 1):
+            if col not in self.frame_columns:
+                items = self.free_columns.pop() if self.free_columns else self.create_column_items()
+                self.frame_columns[col] = items
+                self.place_column(col, items)
+
+    def create_column_items(self):
+        """Create the canvas items for one grid column
+
+        Items are laid out as the reference text followed by a rectangle
+        and a text item for every frame.
+        """
+        canvas = self.frames_canvas
+        items = [canvas.create_text(0, 0, font=("Arial", 12))]
+        for _ in range(len(self.frames)):
+            items.append(canvas.create_rectangle(
+                0, 0, 0, 0, fill="#e0e0ff", outline="black"))
+            items.append(canvas.create_text(0, 0, font=("Arial", 12)))
+        return items
+
+    def place_column(self, col, items):
+        """Move a column's items to step `col` and fill in its values"""
+        canvas = self.frames_canvas
+        step = CELL_SIZE + CELL_PADDING
+        x = GRID_X_START + col * step
+
+        # Reference string value, with the repeat count of a weighted step
+        start, count = self.frame_history.references_at(col)
+        label = str(self.generated_pages[start])
+        if count > 1:
+            label += f"\u00d7{count}"
+        canvas.coords(items[0], x + CELL_SIZE/2, GRID_Y_START + CELL_SIZE/2)
+        canvas.itemconfigure(items[0], text=label, state=tk.NORMAL)
+
+        # Frame states at this step
+        history = self.frame_history
+        state = history.state_at(col)
+        for frame_num in range(len(self.frames)):
+            rect, text = items[1 + 2*frame_num], items[2 + 2*frame_num]
+            y = GRID_Y_START + (frame_num + 1) * step
+            value = state[frame_num]
+            fill_color = "#ff9999" if self.highlight_cell == (col, frame_num) else "#e0e0ff"
+            canvas.coords(rect, x, y, x + CELL_SIZE, y + CELL_SIZE)
+            canvas.itemconfigure(rect, fill=fill_color, state=tk.NORMAL)
+            canvas.coords(text, x + CELL_SIZE/2, y + CELL_SIZE/2)
+            canvas.itemconfigure(
+                text, text="" if value == EMPTY else str(history.page(value)),
+                state=tk.NORMAL)
+
+    def set_frame_highlight(self, cell):
+        """Move the page fault highlight to `cell` (or clear it)"""
+        self.paint_cell(self.highlight_cell, "#e0e0ff")
+        self.highlight_cell = cell
+        self.paint_cell(cell, "#ff9999")
+
+    def paint_cell(self, cell, fill_color):
+        """Fill a grid cell if its column is currently drawn"""
+        if cell is None:
+            return
+        col, frame_num = cell
+        items = self.frame_columns.get(col)
+        if items:
+            self.frames_canvas.itemconfigure(
+                items[1 + 2*frame_num], fill=fill_color)
 
     def prepare_algorithm(self, name):
         """Common setup for all algorithms"""
         try:
             frame_size = int(self.frames_entry.get())
-            if frame_size <= 0 or frame_size > 10:
+            max_frames = LARGE_MAX_FRAMES if self.large_mode.get() else MAX_FRAMES
+            if frame_size <= 0 or frame_size > max_frames:
                 messagebox.showerror(
-                    "Invalid Input", "Number of frames must be between 1 and 10.")
+                    "Invalid Input", f"Number of frames must be between 1 and {max_frames}.")
                 return False
 
             if not self.generated_pages:
                 messagebox.showerror(
                     "No Pages", "Please generate page reference sequence first.")
                 return False
-
-            # Reset simulation state
-            self.current_index = 0
-            # Initialize empty frames with None
-            self.frames = [None] * frame_size
-            # Initialize frame history
-            self.frame_history = [[] for _ in range(frame_size)]
-            self.page_faults = 0
-
-            # Update UI
-            self.log_text.delete(1.0, tk.END)
-            self.log_text.insert(tk.END, f"{name} Algorithm Selected\n")
-            self.log_text.insert(
-                tk.END, f"Page Reference String: {' '.join(map(str, self.generated_pages))}\n\n")
-            self.status_var.set(f"Running {name} algorithm")
-
-            # Disable algorithm buttons during simulation
-            self.fifo_btn.config(state=tk.DISABLED)
-            self.lru_btn.config(state=tk.DISABLED)
-            self.opt_btn.config(state=tk.DISABLED)
-
-            # Enable start button
-            self.start_btn.config(state=tk.NORMAL)
-
-            # Reset canvas
-            self.frames_canvas.delete("all")
-            self.sequence_canvas.delete("highlight")
-
-            return True
         except ValueError:
             messagebox.showerror(
                 "Invalid Input", "Please enter a valid number for frames.")
             return False
 
-    def get_frame_history(self, frame_num):
-        """Get the history of states for a specific frame"""
-        return self.frame_history[frame_num]
+        try:
+            log_cap = int(self.log_cap_entry.get())
+        except ValueError:
+            log_cap = 0
+        if log_cap <= 0:
+            messagebox.showerror(
+                "Invalid Input", "Max log lines must be a positive number.")
+            return False
+        self.log.set_max_lines(log_cap)
 
-    def update_frame_history(self):
-        """Update the history of all frames with their current state"""
-        for i, frame in enumerate(self.frames):
-            self.frame_history[i].append(frame)
+        self.start_run(name, frame_size)
+        return True
 
-    def run_fifo(self):
-        """Setup FIFO algorithm simulation"""
-        if not self.prepare_algorithm("FIFO"):
-            return
+    def start_run(self, name, frame_size):
+        """Reset simulation state for a fresh run of algorithm `name`"""
+        self.current_index = 0
+        self.page_faults = 0
+        # The mode is fixed for the whole run; ticking the box mid-run would
+        # leave it without checkpoints or animate a huge trace on this thread
+        self.run_large = self.large_mode.get()
+        if self.profiler is not None:
+            self.profiler = PhaseProfiler()
+
+        # Update UI
+        self.clear_log()
+        self.write_log(f"{name} Algorithm Selected\n")
+        self.write_log(
+            f"Page Reference String: {format_pages(self.generated_pages)}\n\n")
+        self.status_var.set(f"Running {name} algorithm")
+
+        # Disable algorithm buttons during simulation
+        self.set_algorithm_buttons(tk.DISABLED)
+
+        # Reset canvas
+        self.reset_frames_canvas()
+        self.clear_sequence_highlight()
+
+        if self.run_large and get_policy(name).needs_future:
+            # Indexing a large trace takes seconds; do it off the Tk thread
+            self.start_builder(name, frame_size)
+        else:
+            self.attach_engine(PageReplacementEngine(
+                name, frame_size, self.generated_pages))
+
+    def attach_engine(self, engine):
+        """Make `engine` the selected run's engine and enable its controls"""
+        self.engine = engine
+        self.engine.collapse_repeats = self.compact_mode.get()
+        # Initialize empty frames with None
+        self.frames = self.engine.frames
+        # Initialize frame history (not kept in large-trace mode)
+        self.frame_history = FrameHistory(engine.frame_size)
+        self.page_iter = iter(self.generated_pages)
+        # Large runs keep checkpoints so jumps don't re-simulate from step 0
+        if self.run_large:
+            self.checkpoints = CheckpointStore()
+            self.checkpoints.save(self.engine)
+        else:
+            self.checkpoints = None
 
-        self.algorithm = "FIFO"
-        self.log_text.insert(tk.END, "Click 'Start' to begin animation\n\n")
+        # Enable start and fast-forward buttons
+        self.start_btn.config(state=tk.NORMAL)
+        self.run_end_btn.config(state=tk.NORMAL)
+        self.jump_btn.config(state=tk.NORMAL)
+
+    def start_builder(self, name, frame_size):
+        """Build the engine of a large run on a worker thread
 
-    def run_lru(self):
-        """Setup LRU algorithm simulation"""
-        if not self.prepare_algorithm("LRU"):
+        Stop abandons the build and gives the algorithm buttons back.
+        """
+        self.stop_btn.config(state=tk.NORMAL)
+        self.builder = EngineBuilder(name, frame_size, self.generated_pages)
+        self.builder.start()
+        self.builder_poll_id = self.root.after(WORKER_POLL_MS, self.poll_builder)
+
+    def poll_builder(self):
+        """Show how far the builder has indexed; attach the engine when done"""
+        self.builder_poll_id = None
+        builder = self.builder
+        finished = not builder.is_alive()
+        events = builder.drain()
+        if events:
+            latest = events[-1]
+            self.status_var.set(
+                f"{builder.algorithm}: indexing the reference string, "
+                f"{100 * latest.done // latest.total}%")
+        if not finished:
+            self.builder_poll_id = self.root.after(WORKER_POLL_MS, self.poll_builder)
             return
 
-        self.algorithm = "LRU"
-        self.log_text.insert(tk.END, "Click 'Start' to begin animation\n\n")
+        self.builder = None
+        self.stop_btn.config(state=tk.DISABLED)
+        if builder.error is not None:
+            self.set_algorithm_buttons(tk.NORMAL)
+            self.status_var.set("Simulation reset")
+            messagebox.showerror("Simulation", f"Could not start the run:\n{builder.error}")
+            return
+        self.attach_engine(builder.engine)
+        self.status_var.set(f"Running {builder.algorithm} algorithm")
 
-    def run_opt(self):
-        """Setup OPT algorithm simulation"""
-        if not self.prepare_algorithm("OPT"):
+    def stop_builder(self):
+        """Abandon an engine build in progress"""
+        if self.builder is None:
+            return
+        self.builder.stop()
+        self.builder.join()
+        self.builder = None
+        if self.builder_poll_id:
+            self.root.after_cancel(self.builder_poll_id)
+            self.builder_poll_id = None
+
+    def update_frame_history(self, result, count=1):
+        """Record the frame changed by this step in the history"""
+        self.frame_history.append(result.slot, result.page, count)
+
+    def run_algorithm(self, name):
+        """Setup a simulation of the registered policy `name`"""
+        if not self.prepare_algorithm(name):
             return
 
-        self.algorithm = "OPT"
-        self.log_text.insert(tk.END, "Click 'Start' to begin animation\n\n")
+        self.algorithm = name
+        self.write_log("Click 'Start' to begin animation\n\n")
 
     def start_animation(self):
         """Start the animation"""
         self.is_animating = True
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.NORMAL)
-        self.animate_step()
+        if self.run_large:
+            self.start_worker(len(self.generated_pages), self.finish_simulation)
+        else:
+            self.animate_step()
 
     def stop_animation(self):
         """Stop the animation"""
+        if self.builder is not None:
+            self.stop_builder()
+            self.reset_simulation()
+            self.status_var.set("Run cancelled")
+            return
         self.is_animating = False
         if self.animation_id:
             self.root.after_cancel(self.animation_id)
             self.animation_id = None
+        self.stop_worker()
         self.stop_btn.config(state=tk.DISABLED)
         self.start_btn.config(state=tk.NORMAL)
         self.status_var.set("Animation stopped")
+        if self.profiler is not None:
+            self.show_profile(force=True)
 
     def reset_simulation(self):
         """Reset the simulation"""
         if self.animation_id:
             self.root.after_cancel(self.animation_id)
             self.animation_id = None
+        self.stop_worker()
+        self.stop_builder()
 
         self.is_animating = False
         self.current_index = 0
         self.frames = []
+        self.engine = None
+        self.page_iter = None
+        self.checkpoints = None
+        self.run_large = False
         self.page_faults = 0
 
         # Reset UI
-        self.frames_canvas.delete("all")
-        self.sequence_canvas.delete("highlight")
-        self.log_text.delete(1.0, tk.END)
+        self.reset_frames_canvas()
+        self.clear_sequence_highlight()
+        self.clear_log()
 
         # Reset buttons
-        self.fifo_btn.config(state=tk.NORMAL)
-        self.lru_btn.config(state=tk.NORMAL)
-        self.opt_btn.config(state=tk.NORMAL)
+        self.set_algorithm_buttons(tk.NORMAL)
         self.start_btn.config(state=tk.DISABLED)
         self.stop_btn.config(state=tk.DISABLED)
+        self.run_end_btn.config(state=tk.DISABLED)
+        self.jump_btn.config(state=tk.DISABLED)
 
         self.status_var.set("Simulation reset")
 
@@ -442,180 +997,520 @@ class PageReplacementSimulator:
         """Perform one step of the animation"""
         if not self.is_animating or self.current_index >= len(self.generated_pages):
             if self.current_index >= len(self.generated_pages):
-                self.status_var.set(
-                    f"Simulation complete. Total page faults: {self.page_faults}")
-                self.stop_btn.config(state=tk.DISABLED)
-                self.log_text.insert(
-                    tk.END, f"\nSimulation complete.\nTotal page faults: {self.page_faults}\n")
+                self.finish_simulation()
             return
 
         # Get current page
         current_page = self.generated_pages[self.current_index]
+        count = self.step_count(self.current_index, len(self.generated_pages))
 
-        # Highlight current page in sequence
-        self.highlight_current_page(self.current_index)
+        if self.profiler is not None:
+            self.profiled_step(current_page, count)
+        else:
+            # Highlight current page in sequence
+            self.highlight_current_page(self.current_index)
 
-        # Process according to algorithm
-        if self.algorithm == "FIFO":
-            self.process_fifo_step(current_page)
-        elif self.algorithm == "LRU":
-            self.process_lru_step(current_page)
-        elif self.algorithm == "OPT":
-            self.process_opt_step(current_page)
+            # Process according to algorithm
+            self.process_step(current_page, count)
 
         # Increment index for next step
-        self.current_index += 1
+        self.current_index += count
 
         # Schedule next step
         delay = int(1000 / self.animation_speed)
         self.animation_id = self.root.after(delay, self.animate_step)
 
-    def process_fifo_step(self, current_page):
-        """Process one step of FIFO algorithm"""
-        frame_size = int(self.frames_entry.get())
-        page_fault = False
-        replaced_index = -1
-        replaced_page = None
-
-        if current_page not in self.frames:
-            page_fault = True
-            # Find first empty frame or use FIFO replacement
-            if None in self.frames:
-                replaced_index = self.frames.index(None)
-                self.frames[replaced_index] = current_page
-            else:
-                # FIFO replacement
-                replaced_page = self.frames[0]
-                self.frames = self.frames[1:] + [current_page]
-                replaced_index = frame_size - 1
-            self.page_faults += 1
+    def start_worker(self, target, on_done):
+        """Advance a large-trace run to step `target` on a worker thread
 
-        # Update frame history
-        self.update_frame_history()
+        `on_done` runs on the Tk thread once the target is reached.
+        """
+        self.stop_worker()
+        self.is_animating = True
+        self.start_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.NORMAL)
+        self.worker = EngineWorker(self.engine, self.page_iter, target, self.checkpoints)
+        self.worker_done = on_done
+        self.worker.start()
+        self.worker_poll_id = self.root.after(WORKER_POLL_MS, self.poll_worker)
+
+    def poll_worker(self):
+        """Show the worker's latest progress, coalescing all queued events"""
+        self.worker_poll_id = None
+        worker = self.worker
+        finished = not worker.is_alive()  # Checked first so no event is missed
+        events = worker.drain()
+
+        if self.profiler is not None and events:
+            for event in events:
+                if event.processed:
+                    self.profiler.record("engine", event.elapsed_ns, event.processed)
+                    self.profiler.add_references(event.processed)
+            self.show_profile()
+        if events:
+            latest = events[-1]
+            self.current_index = latest.index
+            self.page_faults = latest.faults
+            self.highlight_current_page(self.current_index - 1)
+            self.status_var.set(
+                f"{self.algorithm}: {self.current_index}/{len(self.generated_pages)} "
+                f"references, {self.page_faults} page faults")
 
-        # Update log
-        if page_fault:
-            if replaced_page is not None:
-                log_msg = f"Page {current_page}: Not in frames, replacing {replaced_page} (FIFO) -> Page Fault!\n"
-            else:
-                log_msg = f"Page {current_page}: Not in frames, adding to empty frame {replaced_index} -> Page Fault!\n"
+        if not finished:
+            self.worker_poll_id = self.root.after(WORKER_POLL_MS, self.poll_worker)
+            return
+
+        self.worker = None
+        self.current_index = self.engine.index
+        self.page_faults = self.engine.page_faults
+        if worker.error is not None:
+            self.is_animating = False
+            self.start_btn.config(state=tk.NORMAL)
+            self.stop_btn.config(state=tk.DISABLED)
+            messagebox.showerror("Simulation", f"Simulation failed:\n{worker.error}")
+            return
+        self.worker_done()
+
+    def stop_worker(self):
+        """Stop a running worker and wait for its current chunk to end"""
+        if self.worker is None:
+            return
+        self.worker.stop()
+        self.worker.join()
+        self.worker = None
+        if self.worker_poll_id:
+            self.root.after_cancel(self.worker_poll_id)
+            self.worker_poll_id = None
+        self.current_index = self.engine.index
+        self.page_faults = self.engine.page_faults
+
+    def finish_simulation(self):
+        """Report the totals once every reference has been processed"""
+        self.is_animating = False
+        self.start_btn.config(state=tk.DISABLED)
+        self.stop_btn.config(state=tk.DISABLED)
+        self.run_end_btn.config(state=tk.DISABLED)
+        self.status_var.set(
+            f"Simulation complete. Total page faults: {self.page_faults}")
+        if self.profiler is not None:
+            self.show_profile(force=True)
+
+        if self.run_large:
+            total = len(self.generated_pages)
+            fault_rate = 100.0 * self.page_faults / total
+            self.write_log(
+                f"Simulation complete.\nReferences: {total}\n"
+                f"Page hits: {self.engine.hits}\n"
+                f"Total page faults: {self.page_faults} ({fault_rate:.2f}%)\n")
         else:
-            log_msg = f"Page {current_page}: Already in frames -> Page Hit\n"
+            self.write_log(
+                f"\nSimulation complete.\nTotal page faults: {self.page_faults}\n")
+        policy_stats = self.engine.policy.stats()
+        if policy_stats:
+            self.write_log(f"{self.algorithm} stats: " + ", ".join(
+                f"{key} {value}" for key, value in policy_stats.items()) + "\n")
+        self.log.flush_file()
+
+    def run_to_end(self):
+        """Compute all remaining steps and render the result once"""
+        self.advance_to(len(self.generated_pages))
+
+    def jump_to_step(self):
+        """Show the simulation state after the step typed in the Step box"""
+        total = len(self.generated_pages)
+        try:
+            target = int(self.jump_entry.get())
+        except ValueError:
+            target = 0
+        if target <= 0 or target > total:
+            messagebox.showerror(
+                "Invalid Input", f"Step must be between 1 and {total}.")
+            return
 
-        self.log_text.insert(tk.END, log_msg)
-        self.log_text.see(tk.END)
+        if target < self.current_index and not self.run_large:
+            # The engine only moves forward, so replay from the start; large
+            # runs restore a checkpoint in advance_to instead
+            self.start_run(self.algorithm, self.engine.frame_size)
+        self.advance_to(target)
 
-        # Update frames display
-        self.draw_frames(replaced_index if page_fault else -1)
+    def advance_to(self, target):
+        """Run the engine up to `target` references without animating
 
-        # Update status
-        self.status_var.set(f"FIFO: Processing page {current_page}, " +
-                            ("Page Fault" if page_fault else "Page Hit"))
-
-    def process_lru_step(self, current_page):
-        """Process one step of LRU algorithm"""
-        frame_size = int(self.frames_entry.get())
-        page_fault = False
-        replaced_index = -1
-        replaced_page = None
-
-        if current_page not in self.frames:
-            page_fault = True
-            # Find first empty frame or use LRU replacement
-            if None in self.frames:
-                replaced_index = self.frames.index(None)
-                self.frames[replaced_index] = current_page
-            else:
-                # Move all pages one position back and put new page at end
-                replaced_page = self.frames[0]
-                self.frames = self.frames[1:] + [current_page]
-                replaced_index = frame_size - 1
-            self.page_faults += 1
-        else:
-            # Move accessed page to the end (most recently used)
-            current_index = self.frames.index(current_page)
-            self.frames = self.frames[:current_index] + \
-                self.frames[current_index + 1:] + [current_page]
+        All steps are computed in a tight loop and the log, frames grid
+        and sequence highlight are then updated in one batched render.
+        """
+        # Pause a running animation; the caller decides what happens next
+        self.is_animating = False
+        if self.animation_id:
+            self.root.after_cancel(self.animation_id)
+            self.animation_id = None
 
-        # Update frame history
-        self.update_frame_history()
+        if self.run_large:
+            # Restore the nearest checkpoint and replay the rest on the
+            # worker thread, so long jumps don't freeze the window
+            self.stop_worker()
+            self.page_iter = self.checkpoints.restore_nearest(
+                self.engine, self.generated_pages, target)
+            self.start_worker(target, self.show_large_step)
+            return
 
-        # Update log
-        if page_fault:
-            if replaced_page is not None:
-                log_msg = f"Page {current_page}: Not in frames, replacing {replaced_page} (LRU) -> Page Fault!\n"
-            else:
-                log_msg = f"Page {current_page}: Not in frames, adding to empty frame {replaced_index} -> Page Fault!\n"
+        if self.current_index < target:
+            log_lines = []
+            while self.current_index < target:
+                count = self.step_count(self.current_index, target)
+                result, log_msg = self.simulate_step(
+                    self.generated_pages[self.current_index], count)
+                log_lines.append(log_msg)
+                self.current_index += count
+
+            self.write_log("".join(log_lines))
+            self.highlight_current_page(self.current_index - 1)
+            self.draw_frames(result.slot)
+            self.status_var.set(
+                f"{self.algorithm}: Jumped to step {self.current_index}, "
+                f"{self.page_faults} page faults")
+        self.finish_advance()
+
+    def show_large_step(self):
+        """Log the state a large-trace jump or Run to End stopped at"""
+        self.highlight_current_page(self.current_index - 1)
+        self.write_log(
+            f"Step {self.current_index}: {self.page_faults} page faults, frames: "
+            f"{format_pages([page for page in self.frames if page is not None])}\n")
+        self.status_var.set(
+            f"{self.algorithm}: {self.current_index}/{len(self.generated_pages)} "
+            f"references, {self.page_faults} page faults")
+        self.finish_advance()
+
+    def finish_advance(self):
+        """Finish the run or wait for Start after a jump"""
+        if self.current_index >= len(self.generated_pages):
+            self.finish_simulation()
         else:
-            log_msg = f"Page {current_page}: Already in frames, moving to MRU position -> Page Hit\n"
+            self.is_animating = False
+            self.start_btn.config(state=tk.NORMAL)
+            self.stop_btn.config(state=tk.DISABLED)
+            self.run_end_btn.config(state=tk.NORMAL)
 
-        self.log_text.insert(tk.END, log_msg)
-        self.log_text.see(tk.END)
+    def run_comparison(self):
+        """Run every algorithm for 1..N frames on a process pool
+
+        N is the Number of Frames input. The runs are polled from the event
+        loop, so the window stays responsive while they execute.
+        """
+        if self.compare_executor is not None:
+            return
+        if not self.generated_pages:
+            messagebox.showerror(
+                "No Pages", "Please generate page reference sequence first.")
+            return
+        try:
+            max_frames = int(self.frames_entry.get())
+        except ValueError:
+            max_frames = 0
+        limit = LARGE_MAX_FRAMES if self.large_mode.get() else MAX_FRAMES
+        if max_frames <= 0 or max_frames > limit:
+            messagebox.showerror(
+                "Invalid Input", f"Number of frames must be between 1 and {limit}.")
+            return
+
+        from compare import start_comparison
+
+        self.compare_sizes = range(1, max_frames + 1)
+        self.compare_executor, self.compare_futures = start_comparison(
+            self.generated_pages, policy_names(), self.compare_sizes)
+        self.compare_btn.config(state=tk.DISABLED)
+        self.status_var.set(
+            f"Comparing {', '.join(policy_names())} for 1-{max_frames} frames...")
+        self.root.after(COMPARE_POLL_MS, self.poll_comparison)
+
+    def poll_comparison(self):
+        """Check the comparison runs and show the results when all are done"""
+        done = sum(future.done() for future in self.compare_futures)
+        if done < len(self.compare_futures):
+            self.status_var.set(
+                f"Comparing: {done}/{len(self.compare_futures)} runs finished")
+            self.root.after(COMPARE_POLL_MS, self.poll_comparison)
+            return
+
+        from compare import collect_results
+
+        try:
+            results = collect_results(self.compare_futures)
+        except Exception as e:
+            messagebox.showerror("Compare", f"Comparison failed:\n{e}")
+            results = None
+        finally:
+            self.compare_executor.shutdown()
+            self.compare_executor = None
+            self.compare_futures = []
+            self.compare_btn.config(state=tk.NORMAL)
+
+        if results is not None:
+            self.status_var.set("Comparison complete")
+            self.show_comparison(results, policy_names(), self.compare_sizes)
+
+    def show_comparison(self, results, algorithms, frame_sizes):
+        """Open a window with the fault table and faults-vs-frames curve"""
+        from charts import draw_line_chart
+        from compare import belady_anomalies, fault_table
+
+        window = tk.Toplevel(self.root)
+        window.title("Algorithm Comparison")
+        window.geometry("700x500")
+
+        # Belady's anomaly summary
+        notes = []
+        for algorithm in algorithms:
+            anomalies = belady_anomalies(results, algorithm, frame_sizes)
+            if anomalies:
+                notes.append(f"{algorithm}: more faults at {', '.join(map(str, anomalies))} frames")
+        ttk.Label(window, text="Belady's anomaly: " + ("; ".join(notes) if notes else "none"),
+                  wraplength=650).pack(side=tk.BOTTOM, anchor=tk.W, padx=10, pady=(0, 10))
+
+        # Fault count table
+        table_frame = ttk.LabelFrame(window, text="Page Faults", padding=10)
+        table_frame.pack(side=tk.LEFT, fill=tk.Y, padx=10, pady=10)
+
+        columns = ("Frames",) + tuple(algorithms)
+        table = ttk.Treeview(table_frame, columns=columns, show="headings", height=15)
+        for column in columns:
+            table.heading(column, text=column)
+            table.column(column, width=70, anchor=tk.CENTER)
+        table_scroll = ttk.Scrollbar(table_frame, command=table.yview)
+        table.configure(yscrollcommand=table_scroll.set)
+        table_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        table.pack(fill=tk.BOTH, expand=True)
+        for row in fault_table(results, algorithms, frame_sizes):
+            table.insert("", tk.END, values=row)
+
+        # Faults vs frames curve
+        chart_frame = ttk.LabelFrame(window, text="Faults vs Frames", padding=10)
+        chart_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10), pady=10)
+        chart = tk.Canvas(chart_frame, bg="white", highlightthickness=1,
+                          highlightbackground="gray")
+        chart.pack(fill=tk.BOTH, expand=True)
+
+        series = {algorithm: [results[(algorithm, size)] for size in frame_sizes]
+                  for algorithm in algorithms}
+        chart.bind("<Configure>", lambda event: draw_line_chart(
+            chart, list(frame_sizes), series, "Frames", "Faults"))
+
+    def run_analysis(self):
+        """Profile the working set and faults of the sequence in a worker process
+
+        The selected algorithm (LRU before any run) is measured at the
+        Number of Frames input.
+        """
+        if self.analysis_executor is not None:
+            return
+        if not self.generated_pages:
+            messagebox.showerror(
+                "No Pages", "Please generate page reference sequence first.")
+            return
+        try:
+            frame_size = int(self.frames_entry.get())
+        except ValueError:
+            frame_size = 0
+        limit = LARGE_MAX_FRAMES if self.large_mode.get() else MAX_FRAMES
+        if frame_size <= 0 or frame_size > limit:
+            messagebox.showerror(
+                "Invalid Input", f"Number of frames must be between 1 and {limit}.")
+            return
+
+        from analytics import default_windows, start_analysis
+
+        algorithm = self.algorithm or ANALYSIS_DEFAULT_ALGORITHM
+        self.analysis_executor, self.analysis_future = start_analysis(
+            self.generated_pages, default_windows(len(self.generated_pages)),
+            algorithm, frame_size)
+        self.analyze_btn.config(state=tk.DISABLED)
+        self.status_var.set(f"Analyzing the workload with {algorithm}, {frame_size} frames...")
+        self.root.after(ANALYSIS_POLL_MS, self.poll_analysis)
+
+    def poll_analysis(self):
+        """Check the analysis and show its charts when it is done"""
+        if not self.analysis_future.done():
+            self.root.after(ANALYSIS_POLL_MS, self.poll_analysis)
+            return
+
+        try:
+            profile = self.analysis_future.result()
+        except Exception as e:
+            messagebox.showerror("Analyze", f"Analysis failed:\n{e}")
+            profile = None
+        finally:
+            self.analysis_executor.shutdown()
+            self.analysis_executor = None
+            self.analysis_future = None
+            self.analyze_btn.config(state=tk.NORMAL)
+
+        if profile is not None:
+            self.status_var.set("Analysis complete")
+            self.show_analysis(profile)
+
+    def show_analysis(self, profile):
+        """Open a window with working-set, fault-rate and fault-distance charts"""
+        from analytics import distance_buckets, distance_summary
+        from charts import draw_line_chart
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Workload Analysis ({profile.algorithm}, {profile.frame_size} frames)")
+        window.geometry("700x700")
+
+        # Summary and export
+        footer = ttk.Frame(window)
+        footer.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 10))
+        summary = distance_summary(profile.fault_distances)
+        ttk.Label(footer, text=(
+            f"{profile.faults} faults in {profile.references} references. "
+            f"Inter-fault distance: mean {summary['mean']:.1f}, median {summary['median']}, "
+            f"p90 {summary['p90']}, max {summary['max']}"),
+            wraplength=550).pack(side=tk.LEFT, anchor=tk.W)
+        ttk.Button(footer, text="Export...",
+                   command=lambda: self.export_analysis(profile)).pack(side=tk.RIGHT)
+
+        steps = profile.steps.tolist()
+        bounds, counts = distance_buckets(profile.fault_distances)
+        charts = (
+            ("Working-Set Size W(t, \u0394)", steps,
+             {f"\u0394={window}": sizes.tolist() for window, sizes in profile.working_sets.items()},
+             "Step", "Pages"),
+            (f"Fault Rate per {profile.sample_every} References", steps,
+             {profile.algorithm: profile.fault_rates.tolist()}, "Step", "Fault rate"),
+            ("Inter-Fault Distances", bounds, {"faults": counts},
+             "Distance (power-of-two buckets)", "Count"),
+        )
+        for title, x_values, series, x_label, y_label in charts:
+            chart_frame = ttk.LabelFrame(window, text=title, padding=10)
+            chart_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 0))
+            chart = tk.Canvas(chart_frame, bg="white", highlightthickness=1,
+                              highlightbackground="gray")
+            chart.pack(fill=tk.BOTH, expand=True)
+            chart.bind("<Configure>", lambda event, chart=chart, args=(
+                x_values, series, x_label, y_label): draw_line_chart(chart, *args))
+
+    def export_analysis(self, profile):
+        """Save an analysis: the sampled series as CSV, or everything as JSON"""
+        path = filedialog.asksaveasfilename(
+            title="Export Analysis", defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("JSON", "*.json")])
+        if not path:
+            return
+        from analytics import write_profile_json, write_series_csv
+
+        try:
+            with open(path, "w", newline="") as f:
+                if path.lower().endswith(".json"):
+                    write_profile_json(profile, f)
+                else:
+                    write_series_csv(profile, f)
+        except OSError as e:
+            messagebox.showerror("Export Analysis", f"Could not write {path}:\n{e}")
+            return
+        self.status_var.set(f"Analysis exported to {path}")
+
+    def process_step(self, current_page, count=1):
+        """Process one step of the selected algorithm through the engine"""
+        result, log_msg = self.simulate_step(current_page, count)
+
+        self.write_log(log_msg)
 
         # Update frames display
-        self.draw_frames(replaced_index if page_fault else -1)
+        self.draw_frames(result.slot)
 
         # Update status
-        self.status_var.set(f"LRU: Processing page {current_page}, " +
-                            ("Page Fault" if page_fault else "Page Hit"))
-
-    def process_opt_step(self, current_page):
-        """Process one step of OPT algorithm"""
-        frame_size = int(self.frames_entry.get())
-        page_fault = False
-        replaced_index = -1
-        replaced_page = None
-
-        if current_page not in self.frames:
-            page_fault = True
-            # Find first empty frame or use OPT replacement
-            if None in self.frames:
-                replaced_index = self.frames.index(None)
-                self.frames[replaced_index] = current_page
-            else:
-                # Find page that won't be used for the longest time
-                farthest_use = -1
-                for i, frame in enumerate(self.frames):
-                    if frame in self.generated_pages[self.current_index+1:]:
-                        next_use = self.generated_pages[self.current_index+1:].index(
-                            frame)
-                        if next_use > farthest_use:
-                            farthest_use = next_use
-                            replaced_index = i
-                    else:
-                        # If not used again, this is optimal
-                        replaced_index = i
-                        break
-
-                replaced_page = self.frames[replaced_index]
-                self.frames[replaced_index] = current_page
-            self.page_faults += 1
+        self.show_step_status(result)
 
-        # Update frame history
-        self.update_frame_history()
+    def profiled_step(self, current_page, count=1):
+        """The highlight and process_step phases, each timed by the profiler
+
+        The redraw phase forces Tk's pending redraws, which would otherwise
+        run when the event loop is idle and go unmeasured.
+        """
+        clock = perf_counter_ns
+        t0 = clock()
+        self.highlight_current_page(self.current_index)
+        t1 = clock()
+        result = self.engine_step(current_page, count)
+        t2 = clock()
+        self.update_frame_history(result, count)
+        t3 = clock()
+        self.write_log(self.step_log_line(result, count))
+        t4 = clock()
+        self.draw_frames(result.slot)
+        t5 = clock()
+        self.show_step_status(result)
+        t6 = clock()
+        self.root.update_idletasks()
+        t7 = clock()
+
+        record = self.profiler.record
+        record("highlight", t1 - t0)
+        record("engine", t2 - t1)
+        record("history", t3 - t2)
+        record("log", t4 - t3)
+        record("draw", t5 - t4)
+        record("status", t6 - t5)
+        record("redraw", t7 - t6)
+        self.profiler.add_references(count)
+        self.show_profile()
+
+    def show_step_status(self, result):
+        """Show the current step's outcome in the status bar"""
+        self.status_var.set(f"{self.algorithm}: Processing page {result.page}, " +
+                            ("Page Fault" if result.fault else "Page Hit"))
+
+    def simulate_step(self, current_page, count=1):
+        """Run one step of `count` references through the engine and record it
+
+        Returns the engine's StepResult and the matching log line.
+        """
+        result = self.engine_step(current_page, count)
 
-        # Update log
-        if page_fault:
-            if replaced_page is not None:
-                log_msg = f"Page {current_page}: Not in frames, replacing {replaced_page} (OPT) -> Page Fault!\n"
+        # Update frame history
+        self.update_frame_history(result, count)
+        return result, self.step_log_line(result, count)
+
+    def engine_step(self, current_page, count=1):
+        """Run one step through the engine and return its StepResult"""
+        result = self.engine.step_run(current_page, count)
+        self.frames = self.engine.frames
+        self.page_faults = self.engine.page_faults
+        return result
+
+    def step_log_line(self, result, count=1):
+        """Simulation Log line describing one step"""
+        current_page = result.page
+        if result.fault:
+            if result.replaced is not None:
+                log_msg = f"Page {current_page}: Not in frames, replacing {result.replaced} ({self.algorithm}) -> Page Fault!"
             else:
-                log_msg = f"Page {current_page}: Not in frames, adding to empty frame {replaced_index} -> Page Fault!\n"
+                log_msg = f"Page {current_page}: Not in frames, adding to empty frame {result.slot} -> Page Fault!"
+        elif self.engine.policy.hit_note:
+            log_msg = f"Page {current_page}: Already in frames, {self.engine.policy.hit_note} -> Page Hit"
         else:
-            log_msg = f"Page {current_page}: Already in frames -> Page Hit\n"
-
-        self.log_text.insert(tk.END, log_msg)
-        self.log_text.see(tk.END)
+            log_msg = f"Page {current_page}: Already in frames -> Page Hit"
+        if count > 1:
+            log_msg += f" (+{count - 1} repeats, all hits)"
+        return log_msg + "\n"
 
-        # Update frames display
-        self.draw_frames(replaced_index if page_fault else -1)
 
-        # Update status
-        self.status_var.set(f"OPT: Processing page {current_page}, " +
-                            ("Page Fault" if page_fault else "Page Hit"))
+def format_pages(pages):
+    """Format a page sequence for the log, truncating long traces"""
+    if len(pages) <= LOG_PREVIEW_PAGES:
+        return ' '.join(map(str, pages))
+    preview = ' '.join(map(str, pages[:LOG_PREVIEW_PAGES]))
+    return f"{preview} ... ({len(pages)} pages)"
 
 
 # Main application launcher
 if __name__ == "__main__":
+    import multiprocessing
+    multiprocessing.freeze_support()  # Process pool workers in frozen builds
     root = tk.Tk()
     app = PageReplacementSimulator(root)
+    if STARTUP_PROBE_FLAG in sys.argv[1:]:
+        # Quit once the window is up; benchmarks/startup.py times this
+        root.after_idle(root.destroy)
     root.mainloop()
@@ -0,0 +1,507 @@
+"""Page replacement policies and the policy registry.
+
+A policy only decides which resident page to evict; the engine owns the
+frames and tells the policy about every reference:
+
+- on_access(page, index, hit) is called for every reference. On a miss it
+  is called after the page has been loaded.
+- choose_victim(page, index) is called on a miss when every frame is in
+  use. It returns the resident page to evict and must drop that page from
+  the policy's own bookkeeping.
+- stats() returns policy-specific counters for display.
+
+A policy sets idempotent_hits when a hit on the page it has just seen
+changes nothing but the index it was last seen at. The engine then
+reports a run of repeated references with one more call at the run's
+last index instead of one call per reference.
+
+A policy sets needs_future when it reads the whole reference string. Its
+constructor then also takes a `progress` callback for build_next_use, so
+a long indexing pass can be shown and abandoned.
+
+New policies subclass ReplacementPolicy and are added with the
+@register_policy decorator; the GUI, the Compare mode and the batch tools
+pick them up from the registry. Every built-in policy costs O(1) (or
+amortized O(1)) per reference, except OPT at O(log frames).
+"""
+import heapq
+from array import array
+from collections import OrderedDict, deque
+
+
+_REGISTRY = {}
+NEXT_USE_CHUNK = 1 << 16  # references indexed between progress calls
+
+
+def register_policy(cls):
+    """Class decorator adding a policy to the registry under cls.name"""
+    if not cls.name:
+        raise ValueError("Policies need a name")
+    _REGISTRY[cls.name] = cls
+    return cls
+
+
+def get_policy(name):
+    """Look up a registered policy class by name"""
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown algorithm: {name}") from None
+
+
+def policy_names():
+    """Names of all registered policies, in registration order"""
+    return tuple(_REGISTRY)
+
+
+def build_next_use(pages, progress=None):
+    """Index of each reference's next occurrence (len(pages) if none)
+
+    Computed in a single backward pass so OPT never rescans the future.
+    `progress`, if given, is called with the number of references indexed
+    so far after every NEXT_USE_CHUNK of them; raising from it abandons
+    the pass.
+    """
+    n = len(pages)
+    next_use = array("q", [n]) * n
+    last_seen = {}
+    for stop in range(n, 0, -NEXT_USE_CHUNK):
+        start = max(stop - NEXT_USE_CHUNK, 0)
+        for i in range(stop - 1, start - 1, -1):
+            page = pages[i]
+            next_use[i] = last_seen.get(page, n)
+            last_seen[page] = i
+        if progress is not None:
+            progress(n - start)
+    return next_use
+
+
+class ReplacementPolicy:
+    """Base class for replacement policies"""
+
+    name = None
+    needs_future = False  # True if the policy reads the whole reference string
+    hit_note = None  # Extra text for hits in the Simulation Log
+    static_state = ()  # Attributes fixed for the whole run, left out of checkpoints
+    idempotent_hits = False  # True if repeating the previous reference is a no-op
+
+    def __init__(self, frame_size, pages=None):
+        self.frame_size = frame_size
+
+    def on_access(self, page, index, hit):
+        """Record a reference (after loading the page on a miss)"""
+
+    def choose_victim(self, page, index):
+        """Pick and forget the resident page to evict for `page`"""
+        raise NotImplementedError
+
+    def stats(self):
+        """Policy-specific counters"""
+        return {}
+
+    def get_state(self):
+        """The policy's mutable state, for engine checkpoints
+
+        Policies must be deterministic so that replaying from a restored
+        checkpoint reproduces the original run.
+        """
+        return {key: value for key, value in vars(self).items()
+                if key not in self.static_state}
+
+    def set_state(self, state):
+        """Restore state returned by get_state"""
+        vars(self).update(state)
+
+
+@register_policy
+class FIFOPolicy(ReplacementPolicy):
+    """Evict the page that was loaded first"""
+
+    name = "FIFO"
+    idempotent_hits = True
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.queue = deque()
+
+    def on_access(self, page, index, hit):
+        if not hit:
+            self.queue.append(page)
+
+    def choose_victim(self, page, index):
+        return self.queue.popleft()
+
+
+@register_policy
+class LRUPolicy(ReplacementPolicy):
+    """Evict the page that was used least recently"""
+
+    name = "LRU"
+    idempotent_hits = True
+    hit_note = "moving to MRU position"
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.recency = OrderedDict()  # LRU first
+
+    def on_access(self, page, index, hit):
+        if hit:
+            self.recency.move_to_end(page)
+        else:
+            self.recency[page] = None
+
+    def choose_victim(self, page, index):
+        return self.recency.popitem(last=False)[0]
+
+
+@register_policy
+class OPTPolicy(ReplacementPolicy):
+    """Evict the page that won't be used for the longest time
+
+    Among pages never used again, the one in the lowest frame goes first.
+    Frames are numbered as the engine fills them: in order while any are
+    empty, then each new page takes its victim's frame.
+    """
+
+    name = "OPT"
+    needs_future = True
+    idempotent_hits = True  # Only the next use after the last repeat matters
+    static_state = ("next_use",)
+
+    def __init__(self, frame_size, pages=None, progress=None):
+        super().__init__(frame_size)
+        self.next_use = build_next_use(pages, progress)
+        self.resident_next = {}  # Resident page -> its next use
+        self.slots = {}  # Resident page -> its frame
+        self.free_slot = None  # Frame freed by the last eviction
+        self.heap = []  # (-next use, frame, page), lazily pruned
+
+    def on_access(self, page, index, hit):
+        next_use = self.next_use[index]
+        self.resident_next[page] = next_use
+        if not hit:
+            if self.free_slot is None:
+                self.slots[page] = len(self.slots)
+            else:
+                self.slots[page] = self.free_slot
+                self.free_slot = None
+        heap = self.heap
+        heapq.heappush(heap, (-next_use, self.slots[page], page))
+
+        # Hits leave stale entries behind; rebuild once they dominate
+        if len(heap) > 2 * self.frame_size + 16:
+            slots = self.slots
+            heap[:] = [(-use, slots[p], p) for p, use in self.resident_next.items()]
+            heapq.heapify(heap)
+
+    def choose_victim(self, page, index):
+        # Pop until the entry still matches its page's next use; older
+        # entries were superseded by later hits
+        while True:
+            neg_use, _, victim = heapq.heappop(self.heap)
+            if self.resident_next.get(victim) == -neg_use:
+                del self.resident_next[victim]
+                self.free_slot = self.slots.pop(victim)
+                return victim
+
+
+@register_policy
+class ClockPolicy(ReplacementPolicy):
+    """Second chance: FIFO that skips pages referenced since the last sweep"""
+
+    name = "CLOCK"
+    idempotent_hits = True
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.ring = []  # Pages in clock order
+        self.referenced = []  # Reference bit per ring position
+        self.position = {}  # Page -> ring position
+        self.hand = 0
+        self.free_position = None  # Ring position freed by the last eviction
+        self.second_chances = 0
+
+    def on_access(self, page, index, hit):
+        if hit:
+            self.referenced[self.position[page]] = True
+        elif self.free_position is None:
+            self.position[page] = len(self.ring)
+            self.ring.append(page)
+            self.referenced.append(True)
+        else:
+            pos = self.free_position
+            self.ring[pos] = page
+            self.referenced[pos] = True
+            self.position[page] = pos
+            self.hand = (pos + 1) % len(self.ring)
+            self.free_position = None
+
+    def choose_victim(self, page, index):
+        ring, referenced = self.ring, self.referenced
+        hand = self.hand
+        while referenced[hand]:
+            referenced[hand] = False
+            self.second_chances += 1
+            hand = (hand + 1) % len(ring)
+        victim = ring[hand]
+        del self.position[victim]
+        self.free_position = self.hand = hand
+        return victim
+
+    def stats(self):
+        return {"second chances": self.second_chances}
+
+
+@register_policy
+class LFUPolicy(ReplacementPolicy):
+    """Evict the least frequently used page (LRU among equal counts)
+
+    Pages sit in per-frequency buckets, so every operation is O(1).
+    """
+
+    name = "LFU"
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.frequency = {}  # Resident page -> reference count
+        self.buckets = {}  # Count -> OrderedDict of pages, oldest first
+        self.min_frequency = 0
+
+    def on_access(self, page, index, hit):
+        buckets = self.buckets
+        if not hit:
+            self.frequency[page] = 1
+            bucket = buckets.get(1)
+            if bucket is None:
+                bucket = buckets[1] = OrderedDict()
+            bucket[page] = None
+            self.min_frequency = 1
+            return
+
+        count = self.frequency[page]
+        self.frequency[page] = count + 1
+        bucket = buckets[count]
+        del bucket[page]
+        if not bucket:
+            del buckets[count]
+            if self.min_frequency == count:
+                self.min_frequency = count + 1
+        bucket = buckets.get(count + 1)
+        if bucket is None:
+            bucket = buckets[count + 1] = OrderedDict()
+        bucket[page] = None
+
+    def choose_victim(self, page, index):
+        bucket = self.buckets[self.min_frequency]
+        victim = bucket.popitem(last=False)[0]
+        if not bucket:
+            del self.buckets[self.min_frequency]
+        del self.frequency[victim]
+        return victim
+
+    def stats(self):
+        return {"min frequency": self.min_frequency}
+
+
+@register_policy
+class ARCPolicy(ReplacementPolicy):
+    """Adaptive Replacement Cache (Megiddo & Modha, 2003)
+
+    Balances a recency list T1 and a frequency list T2, steering the target
+    size of T1 with ghost lists B1/B2 of recently evicted pages.
+    """
+
+    name = "ARC"
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.t1 = OrderedDict()  # Resident, seen once recently (LRU first)
+        self.t2 = OrderedDict()  # Resident, seen at least twice
+        self.b1 = OrderedDict()  # Ghosts evicted from T1
+        self.b2 = OrderedDict()  # Ghosts evicted from T2
+        self.target = 0  # Target size of T1 ("p")
+        self.ghost_hits = 0
+
+    def on_access(self, page, index, hit):
+        if hit:
+            if page in self.t1:
+                del self.t1[page]
+            else:
+                del self.t2[page]
+            self.t2[page] = None
+        elif page in self.b1:
+            del self.b1[page]
+            self.t2[page] = None
+        elif page in self.b2:
+            del self.b2[page]
+            self.t2[page] = None
+        else:
+            self.t1[page] = None
+
+    def choose_victim(self, page, index):
+        c = self.frame_size
+        b1, b2 = self.b1, self.b2
+        if page in b1:
+            self.ghost_hits += 1
+            self.target = min(c, self.target + max(len(b2) // len(b1), 1))
+            return self._replace(page)
+        if page in b2:
+            self.ghost_hits += 1
+            self.target = max(0, self.target - max(len(b1) // len(b2), 1))
+            return self._replace(page)
+
+        if len(self.t1) + len(b1) >= c:
+            if len(self.t1) < c:
+                b1.popitem(last=False)
+                return self._replace(page)
+            # T1 alone fills the cache: drop its LRU page without a ghost
+            return self.t1.popitem(last=False)[0]
+
+        if len(self.t1) + len(self.t2) + len(b1) + len(b2) >= 2 * c:
+            b2.popitem(last=False)
+        return self._replace(page)
+
+    def _replace(self, page):
+        t1 = self.t1
+        if t1 and (len(t1) > self.target or (page in self.b2 and len(t1) == self.target)):
+            victim = t1.popitem(last=False)[0]
+            self.b1[victim] = None
+        else:
+            victim = self.t2.popitem(last=False)[0]
+            self.b2[victim] = None
+        return victim
+
+    def stats(self):
+        return {"target T1": self.target, "T1": len(self.t1), "T2": len(self.t2),
+                "ghost hits": self.ghost_hits}
+
+
+@register_policy
+class TwoQPolicy(ReplacementPolicy):
+    """Full 2Q (Johnson & Shasha, 1994)
+
+    New pages enter the FIFO A1in. Pages evicted from A1in are remembered
+    in the ghost queue A1out, and a miss on a remembered page promotes it
+    to the LRU list Am.
+    """
+
+    name = "2Q"
+    idempotent_hits = True
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        self.kin = max(1, frame_size // 4)  # A1in size before it gives up pages
+        self.kout = max(1, frame_size // 2)  # A1out ghost capacity
+        self.a1in = OrderedDict()  # Resident FIFO, oldest first
+        self.a1out = OrderedDict()  # Ghost FIFO, oldest first
+        self.am = OrderedDict()  # Resident LRU, least recent first
+        self.promote = False  # The pending miss was found in A1out
+
+    def on_access(self, page, index, hit):
+        if hit:
+            if page in self.am:
+                self.am.move_to_end(page)
+            return
+
+        promote = self.promote or page in self.a1out
+        self.promote = False
+        if promote:
+            self.a1out.pop(page, None)
+            self.am[page] = None
+        else:
+            self.a1in[page] = None
+
+    def choose_victim(self, page, index):
+        self.promote = page in self.a1out
+        if len(self.a1in) > self.kin or not self.am:
+            victim = self.a1in.popitem(last=False)[0]
+            self.a1out[victim] = None
+            if len(self.a1out) > self.kout:
+                self.a1out.popitem(last=False)
+            return victim
+        return self.am.popitem(last=False)[0]
+
+    def stats(self):
+        return {"A1in": len(self.a1in), "Am": len(self.am), "A1out": len(self.a1out)}
+
+
+@register_policy
+class LIRSPolicy(ReplacementPolicy):
+    """Low Inter-reference Recency Set (Jiang & Zhang, 2002)
+
+    Most frames hold LIR pages (short reuse distance); a small share holds
+    HIR pages in queue Q, and only HIR pages are evicted. The recency stack
+    S also remembers recently evicted HIR pages (bounded to 2x the frame
+    count) so a quick re-reference can promote them to LIR.
+    """
+
+    name = "LIRS"
+
+    def __init__(self, frame_size, pages=None):
+        super().__init__(frame_size)
+        hir_limit = max(1, frame_size // 100)
+        self.lir_limit = frame_size - hir_limit
+        self.ghost_limit = 2 * frame_size
+        self.stack = OrderedDict()  # S: bottom (oldest) first
+        self.queue = OrderedDict()  # Q: resident HIR pages, front first
+        self.lir = set()
+        self.ghosts = OrderedDict()  # Non-resident HIR pages still in S
+
+    def on_access(self, page, index, hit):
+        stack = self.stack
+        if page in self.lir:
+            at_bottom = next(iter(stack)) == page
+            stack.move_to_end(page)
+            if at_bottom:
+                self._prune()
+            return
+
+        if not hit and len(self.lir) < self.lir_limit:
+            # Warm-up: the first pages fill the LIR set directly
+            self.lir.add(page)
+            stack[page] = None
+            return
+
+        in_stack = page in stack
+        self.ghosts.pop(page, None)
+        if in_stack and self.lir_limit:
+            # Reused while still in S: short reuse distance, promote to LIR
+            self.queue.pop(page, None)
+            self.lir.add(page)
+            stack.move_to_end(page)
+            self._demote_bottom()
+        else:
+            stack[page] = None
+            stack.move_to_end(page)
+            self.queue[page] = None
+            self.queue.move_to_end(page)
+
+    def choose_victim(self, page, index):
+        victim = self.queue.popitem(last=False)[0]
+        if victim in self.stack:
+            self.ghosts[victim] = None
+            if len(self.ghosts) > self.ghost_limit:
+                del self.stack[self.ghosts.popitem(last=False)[0]]
+        return victim
+
+    def _demote_bottom(self):
+        """Turn the LIR page at the bottom of S into a resident HIR page"""
+        bottom = next(iter(self.stack))
+        self.lir.discard(bottom)
+        del self.stack[bottom]
+        self.queue[bottom] = None
+        self._prune()
+
+    def _prune(self):
+        """Drop HIR pages from the bottom of S until an LIR page is there"""
+        stack = self.stack
+        while stack:
+            bottom = next(iter(stack))
+            if bottom in self.lir:
+                break
+            del stack[bottom]
+            self.ghosts.pop(bottom, None)
+
+    def stats(self):
+        return {"LIR": len(self.lir), "HIR resident": len(self.queue),
+                "ghosts": len(self.ghosts)}
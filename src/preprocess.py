@@ -0,0 +1,76 @@
+"""Trace preprocessing: compact a reference stream before simulation.
+
+- Runs: consecutive references to the same page are collapsed into one
+  weighted step (page, count). Every reference after the first in a run
+  is a hit with any policy and any frame count, so fault counts don't
+  change; the engine still shows the policy every hit it depends on (see
+  ReplacementPolicy.idempotent_hits).
+- Interning: sparse page addresses (up to 64-bit) are renumbered 0, 1,
+  2, ... in order of first use. Policies only compare pages for
+  equality, so renumbering leaves every result unchanged, and the
+  dense IDs can index plain arrays.
+
+Both stages stream, so they work on traces of any length.
+"""
+
+
+class Interner:
+    """Dense IDs for page addresses, in order of first use"""
+
+    def __init__(self):
+        self.ids = {}  # Address -> ID
+        self.addresses = []  # ID -> address
+
+    def __len__(self):
+        return len(self.addresses)
+
+    def intern(self, address):
+        """ID of `address`, assigning the next one on first use"""
+        page_id = self.ids.get(address)
+        if page_id is None:
+            page_id = self.ids[address] = len(self.addresses)
+            self.addresses.append(address)
+        return page_id
+
+    def address(self, page_id):
+        """Address of an ID (None passes through)"""
+        return None if page_id is None else self.addresses[page_id]
+
+
+def iter_runs(pages):
+    """Yield (page, count) for each run of consecutive equal references"""
+    pages = iter(pages)
+    for first in pages:
+        break
+    else:
+        return
+    current, count = first, 1
+    for page in pages:
+        if page == current:
+            count += 1
+        else:
+            yield current, count
+            current, count = page, 1
+    yield current, count
+
+
+def compact(pages, interner=None):
+    """Collapse runs and, with an Interner, renumber pages to dense IDs
+
+    Yields (page or ID, count).
+    """
+    runs = iter_runs(pages)
+    if interner is None:
+        return runs
+    intern = interner.intern
+    return ((intern(page), count) for page, count in runs)
+
+
+def run_length(pages, start, stop=None):
+    """Number of references from `start` (before `stop`) equal to pages[start]"""
+    stop = len(pages) if stop is None else min(stop, len(pages))
+    page = pages[start]
+    end = start + 1
+    while end < stop and pages[end] == page:
+        end += 1
+    return end - start
@@ -0,0 +1,229 @@
+"""Many processes sharing one pool of physical frames.
+
+A reference is a (pid, page) pair. Each process has its own page table,
+mapping its pages to frames, so equal page numbers in two processes are
+different pages. The frame pool records which (pid, page) every frame
+holds.
+
+- Global replacement: one policy instance ranks the resident pages of
+  every process, so a fault may evict another process's page.
+- Local replacement: each process has a quota of frames and its own
+  policy instance. A fault takes a free frame until the process has
+  filled its quota and then evicts one of the process's own pages.
+
+Victims always come from a policy's own index, and free frames from a
+stack, so a reference costs the same as in the single-process engine
+however many processes there are. Nothing scans the frame pool.
+"""
+from collections import deque, namedtuple
+from itertools import islice
+
+from policies import get_policy
+
+
+GLOBAL = "global"
+LOCAL = "local"
+SCOPES = (GLOBAL, LOCAL)
+
+# One processed reference. `slot` is the frame that received the page on
+# a fault (-1 on a hit); `replaced` is the evicted (pid, page) or None.
+ProcessStep = namedtuple(
+    "ProcessStep", ["index", "pid", "page", "fault", "slot", "replaced"])
+
+
+class SharedMemoryEngine:
+    """Runs interleaved process streams against a shared frame pool
+
+    `quotas` gives the frames of each process under local replacement,
+    either as a dict by pid or as one count for every process. Quotas
+    can't add up to more than the pool. Policies that need the future
+    (OPT) need the whole interleaved list of (pid, page) `references`.
+    """
+
+    def __init__(self, algorithm, frame_size, scope=GLOBAL, quotas=None, references=None):
+        self.policy_class = get_policy(algorithm)
+        if frame_size <= 0:
+            raise ValueError("Number of frames must be positive.")
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown replacement scope: {scope}")
+        if scope == LOCAL and quotas is None:
+            raise ValueError("Local replacement needs frame quotas.")
+        if self.policy_class.needs_future and references is None:
+            raise ValueError(f"{algorithm} needs the full reference string.")
+
+        self.algorithm = algorithm
+        self.frame_size = frame_size
+        self.scope = scope
+        self.quotas = quotas
+        self.frames = [None] * frame_size  # (pid, page) held by each frame
+        self.free = list(range(frame_size - 1, -1, -1))  # Free frames, next on top
+        self.page_tables = {}  # Pid -> {page: frame}
+        self.policies = {}  # Pid -> its policy, under local replacement
+        self.allocated = 0  # Frames promised to processes by their quotas
+        self.process_steps = {}  # Pid -> references made by the process
+        self.process_faults = {}  # Pid -> faults of the process
+        self.index = 0
+        self.page_faults = 0
+        self.hits = 0
+
+        self._futures = None
+        if scope == GLOBAL:
+            self.policy = self.policy_class(frame_size, references)
+        else:
+            self.policy = None
+            if self.policy_class.needs_future:
+                # Each local policy sees only its own process's references
+                self._futures = {}
+                for pid, page in references:
+                    self._futures.setdefault(pid, []).append(page)
+
+    def add_process(self, pid):
+        """Give `pid` an empty page table (and its policy under local replacement)"""
+        if pid in self.page_tables:
+            return
+        if self.scope == LOCAL:
+            quota = self.quotas.get(pid, 0) if isinstance(self.quotas, dict) else self.quotas
+            if quota <= 0:
+                raise ValueError(f"Process {pid} has no frame quota.")
+            if self.allocated + quota > self.frame_size:
+                raise ValueError("Frame quotas exceed the frame pool.")
+            self.allocated += quota
+            future = self._futures.get(pid, []) if self._futures is not None else None
+            self.policies[pid] = self.policy_class(quota, future)
+        self.page_tables[pid] = {}
+        self.process_steps[pid] = 0
+        self.process_faults[pid] = 0
+
+    def step(self, pid, page):
+        """Process one reference and return its ProcessStep"""
+        if pid not in self.page_tables:
+            self.add_process(pid)
+        if self.scope == GLOBAL:
+            slot, replaced = self._step_global(pid, page)
+        else:
+            slot, replaced = self._step_local(pid, page)
+
+        fault = slot >= 0
+        if fault:
+            self.page_faults += 1
+            self.process_faults[pid] += 1
+        else:
+            self.hits += 1
+        self.process_steps[pid] += 1
+
+        result = ProcessStep(self.index, pid, page, fault, slot, replaced)
+        self.index += 1
+        return result
+
+    def run(self, references, limit=None):
+        """Process (pid, page) references without recording steps
+
+        Consumes at most `limit` references from the iterator and returns
+        how many were processed.
+        """
+        if limit is not None:
+            references = islice(references, limit)
+
+        page_tables = self.page_tables
+        process_steps = self.process_steps
+        process_faults = self.process_faults
+        step = self._step_global if self.scope == GLOBAL else self._step_local
+        start = self.index
+        faults = 0
+        for pid, page in references:
+            if pid not in page_tables:
+                self.add_process(pid)
+            if step(pid, page)[0] >= 0:
+                faults += 1
+                process_faults[pid] += 1
+            process_steps[pid] += 1
+            self.index += 1
+
+        processed = self.index - start
+        self.page_faults += faults
+        self.hits += processed - faults
+        return processed
+
+    def _step_global(self, pid, page):
+        """One reference under global replacement, returning (slot, replaced)"""
+        table = self.page_tables[pid]
+        key = (pid, page)
+        if page in table:
+            self.policy.on_access(key, self.index, True)
+            return -1, None
+
+        replaced = None
+        if self.free:
+            slot = self.free.pop()
+        else:
+            replaced = self.policy.choose_victim(key, self.index)
+            slot = self.page_tables[replaced[0]].pop(replaced[1])
+
+        table[page] = slot
+        self.frames[slot] = key
+        self.policy.on_access(key, self.index, False)
+        return slot, replaced
+
+    def _step_local(self, pid, page):
+        """One reference under local replacement, returning (slot, replaced)"""
+        table = self.page_tables[pid]
+        policy = self.policies[pid]
+        index = self.process_steps[pid]  # Local policies count their own steps
+        if page in table:
+            policy.on_access(page, index, True)
+            return -1, None
+
+        replaced = None
+        if len(table) < policy.frame_size:
+            slot = self.free.pop()  # Quotas never exceed the pool
+        else:
+            victim = policy.choose_victim(page, index)
+            slot = table.pop(victim)
+            replaced = (pid, victim)
+
+        table[page] = slot
+        self.frames[slot] = (pid, page)
+        policy.on_access(page, index, False)
+        return slot, replaced
+
+    def resident(self, pid):
+        """Number of frames held by process `pid`"""
+        return len(self.page_tables.get(pid, ()))
+
+    def stats(self):
+        """Totals over all processes"""
+        return {"faults": self.page_faults, "hits": self.hits,
+                "processes": len(self.page_tables)}
+
+    def process_stats(self):
+        """{pid: (references, faults, resident frames)} per process"""
+        return {pid: (self.process_steps[pid], self.process_faults[pid], len(table))
+                for pid, table in self.page_tables.items()}
+
+
+def equal_quotas(pids, frame_size):
+    """Split `frame_size` frames as evenly as possible over `pids`"""
+    pids = list(pids)
+    if len(pids) > frame_size:
+        raise ValueError("Local replacement needs at least one frame per process.")
+    share, extra = divmod(frame_size, len(pids))
+    return {pid: share + (i < extra) for i, pid in enumerate(pids)}
+
+
+def interleave(streams, quantum=1):
+    """Round-robin (pid, page) references from {pid: iterable of pages}
+
+    Each process runs `quantum` references per turn; finished processes
+    drop out of the rotation.
+    """
+    if quantum <= 0:
+        raise ValueError("Quantum must be positive.")
+    ready = deque((pid, iter(pages)) for pid, pages in streams.items())
+    while ready:
+        pid, pages = ready.popleft()
+        count = 0
+        for page in islice(pages, quantum):
+            yield pid, page
+            count += 1
+        if count == quantum:
+            ready.append((pid, pages))
@@ -0,0 +1,82 @@
+"""Per-phase timing of the simulation loop.
+
+The GUI only creates a PhaseProfiler while profiling is switched on, and
+the untimed code path is taken otherwise, so a disabled profiler costs
+nothing. Timings are kept per reference: a phase that handles a whole
+chunk of references records the chunk's time with its reference count.
+"""
+from collections import deque
+from time import perf_counter_ns
+
+
+DEFAULT_WINDOW = 2000  # recent samples per phase kept for the p99
+
+
+class PhaseProfiler:
+    """Collects timings per phase and summarizes them as mean/p99"""
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.window = window
+        self.samples = {}  # Phase -> recent per-reference times in ns
+        self.totals = {}  # Phase -> [total ns, references]
+        self.references = 0
+        self.started = None  # perf_counter_ns() of the first reference
+
+    def record(self, phase, elapsed_ns, count=1):
+        """Add the time `phase` took for `count` references"""
+        samples = self.samples.get(phase)
+        if samples is None:
+            samples = self.samples[phase] = deque(maxlen=self.window)
+            self.totals[phase] = [0, 0]
+        samples.append(elapsed_ns / count)
+        total = self.totals[phase]
+        total[0] += elapsed_ns
+        total[1] += count
+
+    def add_references(self, count=1):
+        """Count references that went through the loop"""
+        if self.started is None:
+            self.started = perf_counter_ns()
+        self.references += count
+
+    def summary(self):
+        """(phase, mean ns, p99 ns) per phase, in first-recorded order
+
+        The mean covers the whole run, the p99 the last `window` samples.
+        """
+        rows = []
+        for phase, samples in self.samples.items():
+            total_ns, count = self.totals[phase]
+            ordered = sorted(samples)
+            p99 = ordered[min(len(ordered) - 1, len(ordered) * 99 // 100)]
+            rows.append((phase, total_ns / count, p99))
+        return rows
+
+    def work_rate(self):
+        """References per second counting only the timed phases"""
+        busy_ns = sum(total_ns for total_ns, _ in self.totals.values())
+        return 1e9 * self.references / busy_ns if busy_ns else 0.0
+
+    def wall_rate(self):
+        """References per second of wall time since the first reference"""
+        if self.started is None:
+            return 0.0
+        elapsed = perf_counter_ns() - self.started
+        return 1e9 * self.references / elapsed if elapsed else 0.0
+
+    def format_summary(self):
+        """One-line summary for a status bar"""
+        phases = "  ".join(f"{phase} {format_ns(mean)}/{format_ns(p99)}"
+                           for phase, mean, p99 in self.summary())
+        return (f"mean/p99 per ref: {phases or '-'}  |  "
+                f"{self.work_rate():,.0f} refs/s busy, "
+                f"{self.wall_rate():,.1f} refs/s wall")
+
+
+def format_ns(ns):
+    """Format a duration in ns with a readable unit"""
+    if ns >= 1e6:
+        return f"{ns / 1e6:.1f}ms"
+    if ns >= 1e3:
+        return f"{ns / 1e3:.1f}us"
+    return f"{ns:.0f}ns"
@@ -0,0 +1,136 @@
+"""Run the engine on a background thread.
+
+Long runs used to be simulated in chunks on the Tk thread, so the window
+could only react between chunks. An EngineWorker runs the engine on its
+own thread and pushes a Progress event after every chunk into a bounded
+queue. The GUI drains the queue at its own frame rate and shows only the
+latest event, so the display rate is independent of simulation speed.
+
+The queue is bounded, so a worker that gets ahead of the display waits
+instead of piling up events. Stopping takes effect at the next chunk
+boundary. While a worker runs, only the worker may touch its engine.
+
+Building an OPT engine indexes the whole reference string, about half a
+second per million references, so large runs build theirs on an
+EngineBuilder thread that reports Indexing events the same way.
+"""
+import queue
+import threading
+from collections import namedtuple
+from time import perf_counter_ns
+
+from engine import PageReplacementEngine
+
+
+WORKER_CHUNK = 10000  # references per chunk, i.e. between stop checks
+QUEUE_SIZE = 64  # progress events buffered before the worker waits
+PUT_TIMEOUT = 0.05  # seconds between stop checks while the queue is full
+
+# Engine totals after a chunk, plus how many references the chunk held
+# and how long it took
+Progress = namedtuple("Progress", ["index", "faults", "processed", "elapsed_ns"])
+
+# References of the `total` indexed so far while an engine is built
+Indexing = namedtuple("Indexing", ["done", "total"])
+
+
+class _Stopped(Exception):
+    """Raised from a progress callback to abandon a stopped build"""
+
+
+class ProgressThread(threading.Thread):
+    """Daemon thread reporting events through a bounded queue"""
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        super().__init__(daemon=True)
+        self.events = queue.Queue(queue_size)
+        self.error = None  # Exception that ended the run early, if any
+        self._stop_requested = threading.Event()
+
+    def _put(self, event):
+        """Queue an event, waiting while the queue is full unless stopped"""
+        while not self._stop_requested.is_set():
+            try:
+                self.events.put(event, timeout=PUT_TIMEOUT)
+                return
+            except queue.Full:
+                pass
+
+    def stop(self):
+        """Ask the thread to finish its current chunk and exit"""
+        self._stop_requested.set()
+
+    def drain(self):
+        """Take every queued event, oldest first"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+
+class EngineWorker(ProgressThread):
+    """Advances an engine to step `target` on a daemon thread
+
+    `pages` is an iterator positioned at the engine's current step. With a
+    CheckpointStore, checkpoints are saved as the run passes them.
+    """
+
+    def __init__(self, engine, pages, target, checkpoints=None,
+                 chunk=WORKER_CHUNK, queue_size=QUEUE_SIZE):
+        super().__init__(queue_size)
+        self.engine = engine
+        self.pages = pages
+        self.target = target
+        self.checkpoints = checkpoints
+        self.chunk = chunk
+
+    def run(self):
+        engine = self.engine
+        try:
+            while not self._stop_requested.is_set() and engine.index < self.target:
+                count = min(self.chunk, self.target - engine.index)
+                start = perf_counter_ns()
+                if self.checkpoints is not None:
+                    processed = self.checkpoints.run(engine, self.pages, count)
+                else:
+                    processed = engine.run(self.pages, count)
+                self._put(Progress(engine.index, engine.page_faults, processed,
+                                   perf_counter_ns() - start))
+                if processed < count:
+                    break  # The reference string ended early
+        except Exception as e:
+            self.error = e
+
+
+class EngineBuilder(ProgressThread):
+    """Builds a PageReplacementEngine over `pages` on a daemon thread
+
+    Policies that need the future report Indexing events while they index
+    the reference string. `engine` is set once the build succeeds; a
+    stopped build leaves it None.
+    """
+
+    def __init__(self, algorithm, frame_size, pages, queue_size=QUEUE_SIZE):
+        super().__init__(queue_size)
+        self.algorithm = algorithm
+        self.frame_size = frame_size
+        self.pages = pages
+        self.engine = None
+
+    def run(self):
+        total = len(self.pages)
+
+        def progress(done):
+            if self._stop_requested.is_set():
+                raise _Stopped
+            self._put(Indexing(done, total))
+
+        try:
+            self.engine = PageReplacementEngine(
+                self.algorithm, self.frame_size, self.pages, progress)
+        except _Stopped:
+            pass
+        except Exception as e:
+            self.error = e
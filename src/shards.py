@@ -0,0 +1,268 @@
+"""Approximate miss-ratio curves from spatially hashed samples (SHARDS).
+
+Exact runs cost at least one engine step per reference, per frame count
+for policies without a stack-distance pass, and OPT needs the whole
+reference string in memory. SHARDS (Waldspurger et al., FAST 2015)
+instead hashes every page and only follows the pages whose hash falls
+below a threshold T. With T = R * 2**64 about a fraction R of the pages
+is sampled, and every reference to a sampled page is followed, so reuse
+is seen exactly for the pages in the sample.
+
+- LRU: the stack distance among sampled pages, divided by R, estimates
+  the true stack distance, and each sampled reference stands for 1/R
+  references. Memory is bounded by keeping at most `sample_size` pages:
+  when a new page overflows the sample, the pages with the largest hash
+  are dropped and T is lowered to that hash, as in fixed-size SHARDS.
+  The histogram is then corrected so its total matches the number of
+  references (SHARDS_adj).
+- Other policies (e.g. FIFO) are not stack algorithms. They get one
+  miniature simulation per frame count: the sampled references run
+  through the policy with frames * R frames (Waldspurger et al., ATC
+  2017). Memory is bounded by the mini caches, so R stays fixed.
+
+The sampled pages are also split into GROUPS disjoint subsamples by a
+second hash, each giving its own curve. The spread of those curves gives
+the standard error reported with the estimate. A trace whose pages all
+fit in the sample is followed completely and its curve is exact.
+"""
+import math
+from collections import namedtuple
+from heapq import heappop, heappush
+
+from engine import PageReplacementEngine
+from policies import get_policy
+from stackdist import FenwickTree
+
+
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15  # Fibonacci hashing: 2**64 / golden ratio
+GROUP_MULTIPLIER = 0xBF58476D1CE4E5B9
+HASH_MASK = (1 << 64) - 1
+HASH_RANGE = 1 << 64
+GROUP_BITS = 3
+GROUPS = 1 << GROUP_BITS  # subsamples used for the error estimate
+DEFAULT_SAMPLE_SIZE = 16384  # distinct pages kept by the LRU sampler
+MINI_FRAMES = 128  # frames of the smallest mini cache at the default rate
+MIN_RATE = 0.001  # lowest default sampling rate of the mini simulations
+MINI_BATCH = 4096  # sampled references buffered before the mini caches run
+
+# Estimated fault curve. miss_ratios[i], std_errors[i] and faults[i]
+# belong to frame_sizes[i]; rate is the final sampling rate and sampled
+# the number of sampled references.
+ApproximateCurve = namedtuple("ApproximateCurve", [
+    "policy", "frame_sizes", "miss_ratios", "std_errors", "faults",
+    "references", "rate", "sampled"])
+
+
+def page_group(page):
+    """Subsample (0..GROUPS-1) of a sampled page"""
+    return ((page * GROUP_MULTIPLIER) & HASH_MASK) >> (64 - GROUP_BITS)
+
+
+class StackSampler:
+    """Weighted LRU stack-distance histogram of one sampled stream
+
+    Like stackdist.lru_stack_distances, but pages can leave the stream
+    and the number of references is not known in advance, so the Fenwick
+    tree is renumbered whenever its time slots run out.
+    """
+
+    def __init__(self, capacity=1024):
+        self.last_access = {}  # Page -> time slot of its latest reference
+        self.marks = FenwickTree(capacity)
+        self.time = 0
+        self.histogram = {}  # Estimated stack distance -> weight
+        self.cold = 0.0  # Weight of first references
+        self.total = 0.0
+
+    def access(self, page, rate):
+        """Record a reference made while sampling at `rate`"""
+        last_access = self.last_access
+        if self.time == self.marks.size:
+            self._renumber()
+        weight = 1.0 / rate
+        previous = last_access.get(page)
+        if previous is None:
+            self.cold += weight
+        else:
+            distance = len(last_access) - self.marks.prefix_sum(previous) + 1
+            scaled = max(1, round(distance / rate))
+            self.histogram[scaled] = self.histogram.get(scaled, 0.0) + weight
+            self.marks.add(previous, -1)
+        self.total += weight
+        self.marks.add(self.time, 1)
+        last_access[page] = self.time
+        self.time += 1
+
+    def forget(self, page):
+        """Drop a page that left the sample"""
+        previous = self.last_access.pop(page, None)
+        if previous is not None:
+            self.marks.add(previous, -1)
+
+    def _renumber(self):
+        """Give the live pages time slots 0..n-1 in a tree twice that size"""
+        order = sorted(self.last_access, key=self.last_access.get)
+        self.marks = FenwickTree(max(1024, 2 * len(order)))
+        for slot, page in enumerate(order):
+            self.last_access[page] = slot
+            self.marks.add(slot, 1)
+        self.time = len(order)
+
+    def miss_ratios(self, frame_sizes, references):
+        """Miss ratio at each frame count, scaled to `references`
+
+        The weight missing from (or exceeding) `references` is credited to
+        distance 1, the SHARDS_adj correction.
+        """
+        if not references:
+            return [0.0] * len(frame_sizes)
+        hits = references - self.total  # SHARDS_adj
+        ratios = []
+        distances = sorted(self.histogram)
+        i = 0
+        for frames in frame_sizes:
+            while i < len(distances) and distances[i] <= frames:
+                hits += self.histogram[distances[i]]
+                i += 1
+            ratios.append(min(1.0, max(0.0, 1.0 - hits / references)))
+        return ratios
+
+
+def approximate_lru(pages, frame_sizes, sample_size=DEFAULT_SAMPLE_SIZE, salt=0):
+    """Fixed-size SHARDS estimate of the LRU fault curve"""
+    frame_sizes = sorted(frame_sizes)
+    threshold = HASH_RANGE  # Sample pages whose hash is below this
+    sampled = {}  # Page -> its subsample
+    largest = []  # Max-heap of (-hash, page) over the sampled pages
+    combined = StackSampler()
+    groups = [StackSampler() for _ in range(GROUPS)]
+    references = 0
+    sampled_references = 0
+
+    for page in pages:
+        references += 1
+        h = ((page + salt) * HASH_MULTIPLIER) & HASH_MASK
+        if h >= threshold:
+            continue
+
+        group = sampled.get(page)
+        if group is None:
+            group = sampled[page] = page_group(page)
+            heappush(largest, (-h, page))
+            if len(sampled) > sample_size:
+                # Lower the threshold to the largest hash and drop every
+                # page at or above it
+                threshold = -largest[0][0]
+                while largest and -largest[0][0] >= threshold:
+                    _, evicted = heappop(largest)
+                    combined.forget(evicted)
+                    groups[sampled.pop(evicted)].forget(evicted)
+                if h >= threshold:
+                    continue
+
+        sampled_references += 1
+        rate = threshold / HASH_RANGE
+        combined.access(page, rate)
+        groups[group].access(page, rate / GROUPS)
+
+    rate = threshold / HASH_RANGE
+    ratios = combined.miss_ratios(frame_sizes, references)
+    if rate == 1.0:
+        errors = [0.0] * len(frame_sizes)  # Every page was followed
+    else:
+        errors = standard_errors([g.miss_ratios(frame_sizes, references) for g in groups])
+    return ApproximateCurve("LRU", frame_sizes, ratios, errors,
+                            [round(r * references) for r in ratios],
+                            references, rate, sampled_references)
+
+
+def default_rate(frame_sizes):
+    """Sampling rate that gives the smallest mini cache MINI_FRAMES frames"""
+    return min(1.0, max(MIN_RATE, MINI_FRAMES / min(frame_sizes)))
+
+
+def approximate_mini(pages, policy, frame_sizes, rate=None, salt=0):
+    """Estimate a policy's fault curve with miniature simulations"""
+    frame_sizes = sorted(frame_sizes)
+    if get_policy(policy).needs_future:
+        raise ValueError(f"{policy} needs the whole reference string and can't be sampled.")
+    if rate is None:
+        rate = default_rate(frame_sizes)
+    if not 0 < rate <= 1:
+        raise ValueError("Sampling rate must be in (0, 1].")
+
+    def mini_caches(scale):
+        return [PageReplacementEngine(policy, max(1, round(frames * scale)))
+                for frames in frame_sizes]
+
+    combined = mini_caches(rate)
+    split = rate < 1.0  # Subsamples are only needed for the error estimate
+    groups = [mini_caches(rate / GROUPS) for _ in range(GROUPS)] if split else []
+    threshold = int(rate * HASH_RANGE)
+    references = 0
+    batch = []
+
+    def flush():
+        for engine in combined:
+            engine.run(iter(batch))
+        if split:
+            by_group = [[] for _ in range(GROUPS)]
+            for page in batch:
+                by_group[page_group(page)].append(page)
+            for engines, group_batch in zip(groups, by_group):
+                for engine in engines:
+                    engine.run(iter(group_batch))
+        batch.clear()
+
+    for page in pages:
+        references += 1
+        if ((page + salt) * HASH_MULTIPLIER) & HASH_MASK < threshold:
+            batch.append(page)
+            if len(batch) >= MINI_BATCH:
+                flush()
+    flush()
+
+    ratios = [mini_ratio(engine, rate, references) for engine in combined]
+    if split:
+        errors = standard_errors([[mini_ratio(engine, rate / GROUPS, references)
+                                   for engine in engines] for engines in groups])
+    else:
+        errors = [0.0] * len(frame_sizes)
+    return ApproximateCurve(policy, frame_sizes, ratios, errors,
+                            [round(r * references) for r in ratios],
+                            references, rate, combined[0].index)
+
+
+def mini_ratio(engine, rate, references):
+    """Miss ratio estimated from a mini cache sampled at `rate`
+
+    Each fault stands for 1/rate faults of the full trace. Scaling faults
+    rather than dividing by the sampled references keeps a hot page that
+    happens to be sampled (or not) from skewing the ratio.
+    """
+    if not references:
+        return 0.0
+    return min(1.0, engine.page_faults / (rate * references))
+
+
+def approximate_curve(pages, policy, frame_sizes, sample_size=DEFAULT_SAMPLE_SIZE,
+                      rate=None, salt=0):
+    """Estimate `policy`'s fault curve over the iterable `pages` in one pass
+
+    LRU uses fixed-size SHARDS with at most `sample_size` pages; other
+    policies use miniature simulations at `rate` (default_rate if None).
+    """
+    if policy == "LRU":
+        return approximate_lru(pages, frame_sizes, sample_size, salt)
+    return approximate_mini(pages, policy, frame_sizes, rate, salt)
+
+
+def standard_errors(group_ratios):
+    """Standard error of the mean, per frame count, over subsample curves"""
+    count = len(group_ratios)
+    errors = []
+    for values in zip(*group_ratios):
+        mean = sum(values) / count
+        variance = sum((v - mean) ** 2 for v in values) / (count - 1)
+        errors.append(math.sqrt(variance / count))
+    return errors
@@ -0,0 +1,74 @@
+"""In-memory Simulation Log buffer.
+
+Lines waiting to be displayed are kept in a fixed-size ring buffer and
+handed to the GUI in batches; the Text widget holds the displayed lines
+and is trimmed to the same cap. The full log can
+optionally be streamed to a file on disk as it is written.
+"""
+from collections import deque
+
+
+DEFAULT_MAX_LINES = 1000
+
+
+class LogBuffer:
+    """Ring buffer of undisplayed log lines with optional streaming to a file"""
+
+    def __init__(self, max_lines=DEFAULT_MAX_LINES):
+        self.max_lines = max_lines
+        self.pending = deque(maxlen=max_lines)  # Lines not yet displayed
+        self.overflowed = False  # Pending lines were dropped since last take
+        self.file = None
+        self.path = None
+
+    def write(self, text):
+        """Append text (one or more lines) to the log"""
+        for line in text.splitlines(True):
+            if len(self.pending) == self.max_lines:
+                self.overflowed = True
+            self.pending.append(line)
+
+        if self.file is not None:
+            self.file.write(text)
+
+    def take_pending(self):
+        """Return (new lines, overflowed) and mark them as displayed
+
+        When `overflowed` is set, more lines arrived than the cap allows and
+        the returned lines replace the displayed log instead of extending it.
+        """
+        pending = list(self.pending)
+        overflowed = self.overflowed
+        self.pending.clear()
+        self.overflowed = False
+        return pending, overflowed
+
+    def clear(self):
+        """Drop every buffered line (the log file is left untouched)"""
+        self.pending.clear()
+        self.overflowed = False
+
+    def set_max_lines(self, max_lines):
+        """Change the line cap, keeping the most recent pending lines"""
+        if max_lines == self.max_lines:
+            return
+        self.max_lines = max_lines
+        self.pending = deque(self.pending, maxlen=max_lines)
+
+    def open_file(self, path):
+        """Stream every line written from now on to `path`"""
+        self.close_file()
+        self.file = open(path, "w", encoding="utf-8")
+        self.path = path
+
+    def close_file(self):
+        """Stop streaming to the log file"""
+        if self.file is not None:
+            self.file.close()
+        self.file = None
+        self.path = None
+
+    def flush_file(self):
+        """Push buffered file output to disk"""
+        if self.file is not None:
+            self.file.flush()
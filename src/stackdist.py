@@ -0,0 +1,160 @@
+"""Stack-distance analysis: fault counts for every frame count in one pass.
+
+LRU and OPT are stack algorithms: the pages held with c frames are always
+a subset of the pages held with c + 1 frames. A reference therefore faults
+with c frames exactly when its stack distance is greater than c, and one
+pass that records the histogram of stack distances yields the whole fault
+curve (Mattson et al., 1970).
+
+- LRU: the stack distance is the number of distinct pages referenced since
+  the last access to the same page. It is counted with a Fenwick tree over
+  access times that marks only each page's most recent access, so the pass
+  costs O(n log n).
+- OPT: the stack is kept explicitly and reordered by next use, with the
+  page used soonest nearer the top. A reference costs O(depth), and the
+  stack can be truncated at `max_frames` without changing the curve below
+  that size.
+"""
+from policies import build_next_use
+
+
+class FenwickTree:
+    """Binary indexed tree of counts over positions 0..size-1"""
+
+    def __init__(self, size):
+        self.size = size
+        self.tree = [0] * (size + 1)
+
+    def add(self, index, delta):
+        """Add `delta` at position `index`"""
+        tree = self.tree
+        i = index + 1
+        while i <= self.size:
+            tree[i] += delta
+            i += i & -i
+
+    def prefix_sum(self, index):
+        """Sum of positions 0..index"""
+        tree = self.tree
+        total = 0
+        i = index + 1
+        while i > 0:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+
+def lru_stack_distances(pages):
+    """Histogram of LRU stack distances
+
+    Returns (histogram, cold_misses) where histogram[d] counts references
+    with stack distance d (histogram[0] is unused) and cold_misses counts
+    first references.
+    """
+    last_access = {}
+    marks = FenwickTree(len(pages))
+    histogram = [0]
+    cold_misses = 0
+
+    for t, page in enumerate(pages):
+        previous = last_access.get(page)
+        if previous is None:
+            cold_misses += 1
+        else:
+            # Distinct pages accessed after `previous`, plus the page itself
+            distance = len(last_access) - marks.prefix_sum(previous) + 1
+            while len(histogram) <= distance:
+                histogram.append(0)
+            histogram[distance] += 1
+            marks.add(previous, -1)
+        marks.add(t, 1)
+        last_access[page] = t
+
+    return histogram, cold_misses
+
+
+def opt_stack_distances(pages, max_frames=None):
+    """Histogram of OPT stack distances (see lru_stack_distances)
+
+    With `max_frames` set, distances beyond it are counted as misses,
+    which keeps the cost per reference at O(max_frames).
+    """
+    next_use = build_next_use(pages)
+    priority = {}  # Page -> next use time, sooner means higher priority
+    stack = []  # Top of the stack first
+    histogram = [0]
+    cold_misses = 0
+
+    for t, page in enumerate(pages):
+        try:
+            depth = stack.index(page)
+        except ValueError:
+            depth = -1
+
+        if depth < 0:
+            cold_misses += 1
+        else:
+            distance = depth + 1
+            while len(histogram) <= distance:
+                histogram.append(0)
+            histogram[distance] += 1
+
+        priority[page] = next_use[t]
+        if depth == 0:
+            continue
+
+        # Put the page on top and push the displaced pages down. At each
+        # level the higher priority of (carried page, resident page) stays
+        # and the other is carried further down, until the referenced
+        # page's old level (or the bottom) is reached.
+        if not stack:
+            stack.append(page)
+            continue
+        carry = stack[0]
+        stack[0] = page
+        stop = depth if depth > 0 else len(stack)
+        for level in range(1, stop):
+            resident = stack[level]
+            if priority[carry] < priority[resident]:
+                stack[level] = carry
+                carry = resident
+        if depth > 0:
+            stack[depth] = carry
+        elif max_frames is None or len(stack) < max_frames:
+            stack.append(carry)
+        else:
+            del priority[carry]
+
+    return histogram, cold_misses
+
+
+def fault_curve(histogram, cold_misses, max_frames):
+    """Fault counts for 0..max_frames frames from a distance histogram
+
+    curve[c] is the number of faults with c frames; curve[0] is the total
+    number of references.
+    """
+    total = cold_misses + sum(histogram)
+    curve = [total]
+    hits = 0
+    for frames in range(1, max_frames + 1):
+        if frames < len(histogram):
+            hits += histogram[frames]
+        curve.append(total - hits)
+    return curve
+
+
+def lru_fault_curve(pages, max_frames=None):
+    """LRU fault counts for 0..max_frames frames in one pass"""
+    histogram, cold_misses = lru_stack_distances(pages)
+    if max_frames is None:
+        max_frames = len(histogram) - 1
+    return fault_curve(histogram, cold_misses, max_frames)
+
+
+def opt_fault_curve(pages, max_frames=None):
+    """OPT fault counts for 0..max_frames frames in one pass"""
+    histogram, cold_misses = opt_stack_distances(pages, max_frames)
+    if max_frames is None:
+        max_frames = len(histogram) - 1
+    return fault_curve(histogram, cold_misses, max_frames)
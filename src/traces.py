@@ -0,0 +1,214 @@
+"""Readers for page reference trace files.
+
+Supported formats:
+- text: page numbers separated by whitespace, `#` starts a comment
+- CSV: one reference per row, page number in a chosen column; a
+  non-numeric first row is treated as a header
+- binary: packed little-endian integers (int64 by default), read through
+  `mmap` so multi-GB traces are never loaded into a Python list
+
+Every reader yields page numbers one at a time, so the engine can consume
+a trace as a stream. Text and CSV page numbers may be any integer, e.g.
+unsigned 64-bit addresses.
+"""
+import csv
+import mmap
+import os
+import sys
+from array import array
+from itertools import islice
+
+
+CSV_EXTENSIONS = (".csv",)
+BINARY_EXTENSIONS = (".bin", ".trace", ".dat")
+DEFAULT_BINARY_FORMAT = "q"  # array typecode of each packed reference
+READ_CHUNK_ITEMS = 1 << 16  # references read per chunk of a trace
+
+
+class TraceFormatError(ValueError):
+    """Raised when a trace file can't be parsed"""
+
+
+def read_text_trace(path):
+    """Yield page numbers from a whitespace separated text file"""
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split("#", 1)[0]
+            for token in line.split():
+                try:
+                    yield int(token)
+                except ValueError:
+                    raise TraceFormatError(
+                        f"{path}:{line_no}: invalid page number {token!r}") from None
+
+
+def read_csv_trace(path, column=0):
+    """Yield page numbers from one column of a CSV file"""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row_no, row in enumerate(csv.reader(f), 1):
+            if not row:
+                continue
+            try:
+                yield int(row[column])
+            except (ValueError, IndexError):
+                if row_no == 1:
+                    continue  # Header row
+                raise TraceFormatError(
+                    f"{path}:{row_no}: invalid page number in column {column}") from None
+
+
+class MappedTrace:
+    """Read-only, memory-mapped view of a binary trace
+
+    Behaves like a sequence of ints (len, indexing, slicing, iteration), so
+    OPT can index it directly while pages stay in the OS page cache.
+    """
+
+    def __init__(self, path, fmt=DEFAULT_BINARY_FORMAT):
+        self.path = path
+        self.fmt = fmt
+        self.itemsize = array(fmt).itemsize
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        if size % self.itemsize:
+            self._file.close()
+            raise TraceFormatError(
+                f"{path}: size is not a multiple of {self.itemsize} bytes")
+
+        if size:
+            self._mmap = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            # Native-order view for fast indexing; big-endian hosts go
+            # through the byte-swapping chunked path instead
+            self._view = (memoryview(self._mmap).cast(fmt)
+                          if sys.byteorder == "little" else None)
+        else:
+            self._mmap = None
+            self._view = None
+        self._length = size // self.itemsize
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if self._view is not None:
+            item = self._view[index]
+            return item.tolist() if isinstance(item, memoryview) else item
+
+        # Decode through the chunk reader on big-endian hosts
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("trace index out of range")
+        return self._read_chunk(index, index + 1)[0]
+
+    def __iter__(self):
+        for start in range(0, self._length, READ_CHUNK_ITEMS):
+            yield from self._read_chunk(start, start + READ_CHUNK_ITEMS)
+
+    def _read_chunk(self, start, stop):
+        """Decode references [start, stop) into an array"""
+        chunk = array(self.fmt)
+        chunk.frombytes(self._mmap[start * self.itemsize:stop * self.itemsize])
+        if sys.byteorder != "little":
+            chunk.byteswap()
+        return chunk
+
+    def close(self):
+        """Release the mapping and the file"""
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_binary_trace(path, fmt=DEFAULT_BINARY_FORMAT):
+    """Yield page numbers from a packed binary trace via mmap"""
+    with MappedTrace(path, fmt) as trace:
+        yield from trace
+
+
+def write_binary_trace(path, pages, fmt=DEFAULT_BINARY_FORMAT):
+    """Write page numbers as a packed little-endian binary trace"""
+    with open(path, "wb") as f:
+        chunk = array(fmt)
+        for page in pages:
+            chunk.append(page)
+            if len(chunk) == READ_CHUNK_ITEMS:
+                _write_chunk(f, chunk)
+                chunk = array(fmt)
+        _write_chunk(f, chunk)
+
+
+def _write_chunk(f, chunk):
+    if sys.byteorder != "little":
+        chunk.byteswap()
+    chunk.tofile(f)
+
+
+def trace_kind(path):
+    """Return 'text', 'csv' or 'binary' based on the file extension"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in CSV_EXTENSIONS:
+        return "csv"
+    if ext in BINARY_EXTENSIONS:
+        return "binary"
+    return "text"
+
+
+def iter_trace(path, fmt=DEFAULT_BINARY_FORMAT, column=0):
+    """Stream the page numbers of any supported trace file"""
+    kind = trace_kind(path)
+    if kind == "csv":
+        return read_csv_trace(path, column)
+    if kind == "binary":
+        return read_binary_trace(path, fmt)
+    return read_text_trace(path)
+
+
+def load_trace(path, fmt=DEFAULT_BINARY_FORMAT, column=0):
+    """Open a trace as an indexable sequence
+
+    Binary traces are memory-mapped (call close() when done); text and
+    CSV traces are parsed into a packed int64 array, or uint64 if a page
+    number needs it, or a list of ints if neither holds every value.
+    """
+    if trace_kind(path) == "binary":
+        return MappedTrace(path, fmt)
+    pages = array("q")
+    references = iter_trace(path, fmt, column)
+    while True:
+        chunk = list(islice(references, READ_CHUNK_ITEMS))
+        if not chunk:
+            return pages
+        size = len(pages)
+        try:
+            pages.extend(chunk)
+        except OverflowError:
+            del pages[size:]  # extend() keeps the values before the bad one
+            pages = _widen(pages, chunk)
+
+
+def _widen(pages, chunk):
+    """`pages` followed by `chunk`, in uint64 if they fit, else in a list"""
+    if pages.typecode == "q":
+        try:
+            wide = array("Q", pages)
+            wide.extend(chunk)
+            return wide
+        except OverflowError:
+            pass  # Negative or wider than 64 bits
+    wide = pages.tolist()
+    wide.extend(chunk)
+    return wide
@@ -0,0 +1,156 @@
+"""Synthetic page reference workloads, vectorized with NumPy.
+
+Every generator yields int64 arrays of at most `chunk_size` references, so
+traces of 10^8 references and more can be produced and consumed in bounded
+memory. Random workloads take a seed or a numpy.random.Generator, so a run
+can be reproduced exactly.
+
+NumPy is an optional dependency; only this module needs it.
+"""
+import numpy as np
+
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def make_rng(seed=None):
+    """Return a numpy Generator (an existing Generator is returned as is)"""
+    return np.random.default_rng(seed)
+
+
+def _chunk_sizes(n, chunk_size):
+    while n > 0:
+        size = min(n, chunk_size)
+        yield size
+        n -= size
+
+
+def uniform(n, pages, rng=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """References drawn uniformly from pages 0..pages-1"""
+    rng = make_rng(rng)
+    for size in _chunk_sizes(n, chunk_size):
+        yield rng.integers(0, pages, size, dtype=np.int64)
+
+
+def zipf(n, pages, alpha=1.0, rng=None, chunk_size=DEFAULT_CHUNK_SIZE,
+         shuffle=False):
+    """Bounded Zipf: page k is referenced with probability ~ 1/(k+1)^alpha
+
+    With `shuffle`, popularity ranks are assigned to random page numbers
+    instead of 0, 1, 2, ...
+    """
+    rng = make_rng(rng)
+    weights = np.arange(1, pages + 1, dtype=np.float64) ** -alpha
+    cdf = np.cumsum(weights)
+    cdf /= cdf[-1]
+    ranks_to_pages = rng.permutation(pages) if shuffle else None
+
+    for size in _chunk_sizes(n, chunk_size):
+        ranks = np.searchsorted(cdf, rng.random(size), side="right")
+        np.minimum(ranks, pages - 1, out=ranks)  # Guard against rounding
+        refs = ranks if ranks_to_pages is None else ranks_to_pages[ranks]
+        yield refs.astype(np.int64, copy=False)
+
+
+def working_set(n, pages, set_size, phase_length, rng=None,
+                chunk_size=DEFAULT_CHUNK_SIZE, outside=0.0):
+    """Phases of references concentrated in a moving working set
+
+    Each phase of `phase_length` references draws uniformly from a
+    contiguous window of `set_size` pages placed at random in 0..pages-1.
+    A fraction `outside` of references goes anywhere in the page range.
+    """
+    rng = make_rng(rng)
+    set_size = min(set_size, pages)
+    current_phase = -1
+    current_base = 0
+    position = 0
+
+    for size in _chunk_sizes(n, chunk_size):
+        phase = (position + np.arange(size, dtype=np.int64)) // phase_length
+        first_phase = int(phase[0])
+        phase_count = int(phase[-1]) - first_phase + 1
+
+        # Window base for every phase touched by this chunk; a phase that
+        # started in the previous chunk keeps its base
+        bases = rng.integers(0, pages - set_size + 1, phase_count, dtype=np.int64)
+        if first_phase == current_phase:
+            bases[0] = current_base
+        current_phase = first_phase + phase_count - 1
+        current_base = int(bases[-1])
+
+        refs = bases[phase - first_phase] + rng.integers(0, set_size, size, dtype=np.int64)
+        if outside > 0:
+            stray = rng.random(size) < outside
+            refs[stray] = rng.integers(0, pages, int(stray.sum()), dtype=np.int64)
+        position += size
+        yield refs
+
+
+def sequential(n, pages, start=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """A scan through pages start, start+1, ... wrapping at `pages`"""
+    position = start
+    for size in _chunk_sizes(n, chunk_size):
+        yield (position + np.arange(size, dtype=np.int64)) % pages
+        position += size
+
+
+def looping(n, loop_length, start=0, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Repeat the loop start .. start+loop_length-1 over and over"""
+    position = 0
+    for size in _chunk_sizes(n, chunk_size):
+        yield start + (position + np.arange(size, dtype=np.int64)) % loop_length
+        position += size
+
+
+def mixed(n, sources, weights, rng=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Interleave several workloads, picking a source per reference
+
+    `sources` are chunk iterators (e.g. from the generators above) that can
+    each supply up to `n` references; `weights` are their mixing ratios.
+    """
+    rng = make_rng(rng)
+    p = np.asarray(weights, dtype=np.float64)
+    p /= p.sum()
+    streams = [_ChunkReader(source) for source in sources]
+
+    for size in _chunk_sizes(n, chunk_size):
+        choice = rng.choice(len(streams), size, p=p)
+        refs = np.empty(size, dtype=np.int64)
+        for i, stream in enumerate(streams):
+            mask = choice == i
+            refs[mask] = stream.take(int(mask.sum()))
+        yield refs
+
+
+class _ChunkReader:
+    """Read exact numbers of references from an iterator of chunks"""
+
+    def __init__(self, chunks):
+        self.chunks = iter(chunks)
+        self.buffer = np.empty(0, dtype=np.int64)
+
+    def take(self, count):
+        parts = []
+        while count > 0:
+            if not len(self.buffer):
+                try:
+                    self.buffer = next(self.chunks)
+                except StopIteration:
+                    raise ValueError("workload source ran out of references") from None
+            part, self.buffer = self.buffer[:count], self.buffer[count:]
+            parts.append(part)
+            count -= len(part)
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def to_array(chunks):
+    """Concatenate a workload into one int64 array"""
+    parts = list(chunks)
+    return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+
+def iter_pages(chunks):
+    """Flatten a workload into Python ints for PageReplacementEngine.run"""
+    for chunk in chunks:
+        yield from chunk.tolist()